@@ -1,45 +1,66 @@
+import heapq
 import logging
+import multiprocessing
 
-import fitz  # PyMuPDF
 import numpy as np
-from collections import defaultdict
-from typing import List, Dict, Tuple
-import warnings  # Import warnings to suppress KMeans warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from types import SimpleNamespace
+from typing import List, Dict, Optional, Union
+
+from .clustering import two_means_1d
 
 logger = logging.getLogger(__name__)
 
 class AdaptiveFitzExtractor:
-    def __init__(self):
+    def __init__(self, num_workers: int = 1):
         self.column_threshold = 0.3  # 列间距阈值
         self.min_column_width = 0.25  # 最小列宽比例
+        # 并行提取页面的进程数，默认为 1（不启用进程池）；
+        # 启动子进程的开销只有在长文档上才能收回，需要时由调用方显式开启
+        self.num_workers = num_workers
+        # 文档内列检测结果缓存，键为 _cluster_key 计算的版式特征，每个文档开始时清空
+        self._cluster_cache: Dict[tuple, List[float]] = {}
 
     def extract_text(self, pdf_path: str) -> str:
         """主提取函数"""
-        doc = fitz.open(pdf_path)
-        full_text = []
-
-        # for page_num in range(doc.page_count):
-        if doc.page_count > 0:
-            page_num = 0
-            page = doc[page_num]
-            page_text = self._extract_page_text(page)
-            if page_text:
-                full_text.append(page_text)
-
-        doc.close()
-        return '\n\n'.join(full_text)
+        # PyMuPDF 导入开销较大，延迟到首次提取时再导入，避免拖慢 import smartextractor
+        import fitz  # PyMuPDF
+
+        self._cluster_cache.clear()
+        with fitz.open(pdf_path) as doc:
+            page_count = doc.page_count
+            workers = min(self.num_workers, page_count)
+            if workers <= 1:
+                page_texts = [self._extract_page_text(page) for page in doc]
+
+        if workers > 1:
+            # fitz.Document 不能跨进程传递，每个子进程自行打开文档并处理一段连续页面
+            chunk_size = -(-page_count // workers)
+            page_ranges = [range(start, min(start + chunk_size, page_count))
+                           for start in range(0, page_count, chunk_size)]
+            # 显式使用 spawn：fork 会把父进程中已打开的 MuPDF 状态复制到子进程
+            with ProcessPoolExecutor(max_workers=len(page_ranges),
+                                     mp_context=multiprocessing.get_context("spawn")) as executor:
+                page_texts = [text for chunk in executor.map(_extract_page_range, repeat(self), repeat(pdf_path), page_ranges)
+                              for text in chunk]
+
+        return '\n\n'.join(text for text in page_texts if text)
 
     def _extract_page_text(self, page) -> str:
         """提取单页文本"""
         # 获取文本块
-        blocks = self._get_line_text_blocks(page)#_get_text_blocks(page)
+        blocks = self._get_line_text_blocks(page)
         if not blocks:
             return ""
 
+        # 只按y坐标稳定排序一次，后续单列/多列提取直接使用排序后的顺序
+        order = np.argsort(self._blocks_to_bbox_array(blocks)[:, 1], kind='stable')
+        blocks = [blocks[i] for i in order.tolist()]
+
         # 检测布局类型
         layout_type = self._detect_layout_type(blocks, page.rect.width)
-        logger.debug(f"layout_type: {layout_type}")
-        print(f"layout_type: {layout_type}")
+        logger.debug("layout_type: %s", layout_type)
 
         if layout_type == "single_column":
             return self._extract_single_column(blocks)
@@ -61,62 +82,23 @@ class AdaptiveFitzExtractor:
 
                 # 只有当行文本非空时才处理
                 if line_text.strip():
-                    bbox = line["bbox"]
-                    line_blocks.append({
-                        'text': line_text.strip(),
-                        'bbox': bbox,
-                        'x0': bbox[0],
-                        'y0': bbox[1],
-                        'x1': bbox[2],
-                        'y1': bbox[3],
-                        'width': bbox[2] - bbox[0],
-                        'height': bbox[3] - bbox[1]
-                    })
+                    line_blocks.append({'text': line_text.strip(), 'bbox': line["bbox"]})
 
         return line_blocks
 
-    def _get_text_blocks(self, page) -> List[Dict]:
-        """获取并处理文本块"""
-        blocks = []
-        text_dict = page.get_text("dict")
-
-        for block in text_dict["blocks"]:
-            if "lines" not in block:
-                continue
-
-            # 合并文本块内容
-            block_text = ""
-            for line in block["lines"]:
-                line_text = ""
-                for span in line["spans"]:
-                    line_text += span["text"]
-                block_text += line_text + "\n"
-
-            if block_text.strip():
-                blocks.append({
-                    'text': block_text.strip(),
-                    'bbox': block["bbox"],
-                    'x0': block["bbox"][0],
-                    'y0': block["bbox"][1],
-                    'x1': block["bbox"][2],
-                    'y1': block["bbox"][3],
-                    'width': block["bbox"][2] - block["bbox"][0],
-                    'height': block["bbox"][3] - block["bbox"][1]
-                })
-
-        return blocks
-
     def _detect_layout_type(self, blocks: List[Dict], page_width: float) -> str:
         """检测布局类型：单列或多列"""
         if len(blocks) < 2:
             return "single_column"
 
+        thr = self._page_thresholds(page_width)
+
         # 方法1: 基于文本块x坐标分布
-        x_positions = [block['x0'] for block in blocks]
-        x_centers = [(block['x0'] + block['x1']) / 2 for block in blocks]
+        bbox_arr = self._blocks_to_bbox_array(blocks)
+        x_centers = 0.5 * (bbox_arr[:, 0] + bbox_arr[:, 2])
 
-        # 使用K-means聚类检测列数
-        column_centers = self._detect_columns_kmeans(x_centers, page_width)
+        # 使用一维 2-means 聚类检测列数
+        column_centers = self._detect_columns_kmeans(x_centers, page_width, thr)
 
         # 只有当_detect_columns_kmeans明确检测到两列时，才认为它是多列
         if len(column_centers) >= 2:
@@ -126,163 +108,169 @@ class AdaptiveFitzExtractor:
             right_distance = abs(page_width/2 - column_centers[1])
             ratio_distance = min(left_distance, right_distance) / max(left_distance, right_distance)
             # 列中心距离应大于页面宽度的30%才认为是两列
-            if center_distance > page_width * 0.3 and ratio_distance > 0.3:
+            if center_distance > thr.cs and ratio_distance > 0.3:
                 return "multi_column"
-            elif self._has_clear_column_gap(blocks, page_width):
+            elif self._has_clear_column_gap(blocks, thr):
                 return "multi_column"
             else:
                 # 如果聚类检测到两列但没有明显的物理间距，可能不是标准双栏
-                logger.debug("KMeans detected two columns but no clear gap. Might be single column with wide text.")
+                logger.debug("2-means detected two columns but no clear gap. Might be single column with wide text.")
 
         # 方法2: 基于文本块宽度分析 (作为辅助判断)
-        avg_width = np.mean([block['width'] for block in blocks])
+        avg_width = float(np.mean(bbox_arr[:, 2] - bbox_arr[:, 0]))
         # 如果平均宽度小于页面宽度的60%，且没有被明确判断为单列，则可能是多列
-        if avg_width < page_width * 0.6 and len(column_centers) < 2:  # 避免与方法1冲突
-            logger.debug(
-                f"Layout detected as multi_column based on average block width ({avg_width:.2f} < {page_width * 0.6:.2f})")
+        if avg_width < thr.wide and len(column_centers) < 2:  # 避免与方法1冲突
+            logger.debug("Layout detected as multi_column based on average block width (%.2f < %.2f)",
+                         avg_width, thr.wide)
             return "multi_column"
 
         return "single_column"
 
-    def _detect_columns_kmeans(self, x_centers: List[float], page_width: float) -> List[float]:
+    @staticmethod
+    def _page_thresholds(page_width: float) -> SimpleNamespace:
+        """
+        按页面宽度一次性算出检测用的各项阈值：
+        sep 为两列中心的最小距离，cs/ce 为页面中央区域的起止位置，wide 为多列判定的平均块宽上限
+        """
+        return SimpleNamespace(sep=page_width * 0.2, cs=page_width * 0.3,
+                               ce=page_width * 0.7, wide=page_width * 0.6)
+
+    @staticmethod
+    def _blocks_to_bbox_array(blocks: List[Dict]) -> np.ndarray:
+        """将文本块的 bbox 转为 (N, 4) 数组，便于向量化计算"""
+        return np.asarray([block['bbox'] for block in blocks], dtype=np.float64).reshape(-1, 4)
+
+    def _detect_columns_kmeans(self, x_centers: Union[List[float], np.ndarray], page_width: float,
+                               thr: Optional[SimpleNamespace] = None) -> List[float]:
         """
-        使用聚类检测列中心。
+        使用一维 2-means 聚类检测列中心。
         如果能自信地检测到两列，则返回两个列中心的列表；否则返回空列表。
+        thr 为 _page_thresholds 计算的本页阈值，未传入时按 page_width 计算。
         """
         if len(x_centers) < 2:
             return []  # 数据不足，无法检测多列
 
-        x_centers_np = np.array(x_centers).reshape(-1, 1)
-
-        # 尝试2列K-Means聚类
-        try:
-            from sklearn.cluster import KMeans
-            # 抑制 KMeans 的 n_init 警告
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", UserWarning)
-                kmeans = KMeans(n_clusters=2, random_state=42, n_init=10)
-                clusters = kmeans.fit_predict(x_centers_np)
-                centers = kmeans.cluster_centers_.flatten()
-
-            # 检查聚类质量：确保形成了两个不同的簇，并且它们之间有足够的距离
-            if len(set(clusters)) == 2:  # 确保确实分成了两类
-                center_distance = abs(centers[1] - centers[0])
-                # 列中心距离应大于页面宽度的20%才认为是两列
-                if center_distance > page_width * 0.2:
-                    return sorted(centers)
-        except ImportError:
-            logger.debug("scikit-learn not installed, falling back to histogram method for column detection.")
-        except Exception as e:  # 捕获其他 KMeans 错误，例如数据退化
-            logger.debug(f"KMeans failed: {e}, falling back to histogram method.")
-
-        # 备用方案：简单的直方图峰值检测 (改进版)
-        # 使用更细的 bin 来提高分辨率
-        hist, bins = np.histogram(x_centers, bins=50)  # 增加 bin 数量
-
-        # 寻找峰值：一个峰值比其相邻点高，且高于整体最大值的某个比例
-        peaks = []
-        for i in range(1, len(hist) - 1):
-            if hist[i] > hist[i - 1] and hist[i] > hist[i + 1] and hist[i] > np.max(hist) * 0.1:  # 降低峰值检测阈值
-                peaks.append((bins[i] + bins[i + 1]) / 2)
-
-        # 过滤峰值，寻找两个足够分离的峰值作为列中心
-        if len(peaks) >= 2:
-            sorted_peaks = sorted(peaks)
-
-            # 检查最左和最右的峰值是否足够分离
-            if (sorted_peaks[-1] - sorted_peaks[0]) > page_width * 0.2:
-                # 如果有多个峰值，取最左和最右的作为潜在列中心
-                return [sorted_peaks[0], sorted_peaks[-1]]
-            elif len(sorted_peaks) >= 2:  # 如果不远，但仍有两个峰值，取前两个
-                return sorted_peaks[:2]
-
-        return []  # 如果无法自信地检测到两列，返回空列表
-
-    def _has_clear_column_gap(self, blocks: List[Dict], page_width: float) -> bool:
-        """检测是否有明显的列间距"""
+        x_centers = np.asarray(x_centers, dtype=np.float64).ravel()
+        # 同一文档中版式特征相同的页面直接复用之前的检测结果
+        cache_key = self._cluster_key(x_centers, page_width)
+        if cache_key not in self._cluster_cache:
+            centers = two_means_1d(x_centers)
+            # 列中心距离应大于页面宽度的20%才认为是两列，否则返回空列表
+            if thr is None:
+                thr = self._page_thresholds(page_width)
+            self._cluster_cache[cache_key] = list(centers) if centers and centers[1] - centers[0] > thr.sep else []
+        return list(self._cluster_cache[cache_key])
+
+    @staticmethod
+    def _cluster_key(x_centers: np.ndarray, page_width: float) -> tuple:
+        """版式特征：x 中心在页面宽度上的 32 档直方图，特征相同的页面共享列检测结果"""
+        hist = np.histogram(x_centers, bins=32, range=(0, page_width))[0]
+        return (round(float(page_width), 1), len(x_centers), tuple(hist.tolist()))
+
+    def _has_clear_column_gap(self, blocks: List[Dict], thr: SimpleNamespace) -> bool:
+        """检测是否有明显的列间距，thr 为 _page_thresholds 计算的本页阈值"""
         # 在页面中央区域寻找空白区域
-        center_start = page_width * 0.3
-        center_end = page_width * 0.7
+        center_start = thr.cs
+        center_end = thr.ce
 
         # 检查是否有文本块横跨中央区域
         for block in blocks:
-            if (block['x0'] < center_start and block['x1'] > center_end):
+            if (block['bbox'][0] < center_start and block['bbox'][2] > center_end):
                 return False
 
         # 检查中央区域的文本密度
         center_blocks = [block for block in blocks
-                         if block['x0'] >= center_start and block['x1'] <= center_end]
+                         if block['bbox'][0] >= center_start and block['bbox'][2] <= center_end]
 
         return len(center_blocks) < len(blocks) * 0.2
 
     def _extract_single_column(self, blocks: List[Dict]) -> str:
-        """提取单列文本"""
-        # 按y坐标排序
-        blocks.sort(key=lambda x: x['y0'])
+        """提取单列文本，blocks 需已按y坐标排序"""
         return '\n'.join([block['text'] for block in blocks])
 
-    def _extract_multi_column(self, blocks: List[Dict], page_width: float) -> str:
-        """提取多列文本"""
-        logger.debug(f"enter _extract_multi_column with page_width: {page_width}")
-
-        x_centers = [(block['x0'] + block['x1']) / 2 for block in blocks]
-        column_centers = self._detect_columns_kmeans(x_centers, page_width)
-
-        split_point = page_width / 2  # 默认分割点，如果无法通过更精确方法确定
-
+    def _extract_multi_column(self, blocks: List[Dict], page_width: Optional[float] = None) -> str:
+        """
+        按阅读顺序提取双栏文本（DocReader 的拓扑排序思路），blocks 需已按y坐标排序。
+        以分割点把文本块分到左右两栏；跨过分割点、或同时与左右两栏的文本块水平重叠的块视为通栏
+        （标题、图注等）。栏内的块按 y 坐标先后读出，通栏块与所有块按 y 坐标排序，
+        因此通栏块把页面分成上下若干段，每段内先读完左栏再读右栏。
+        page_width 未提供时以文本块的最右边界代替。
+        """
+        bbox_arr = self._blocks_to_bbox_array(blocks)
+        x_centers = 0.5 * (bbox_arr[:, 0] + bbox_arr[:, 2])
+        y_centers = 0.5 * (bbox_arr[:, 1] + bbox_arr[:, 3])
+        if page_width is None:
+            page_width = float(bbox_arr[:, 2].max())
+
+        split_point = self._find_split_point(bbox_arr, x_centers, page_width)
+        is_right = x_centers >= split_point
+
+        # 水平重叠宽度超过较窄块宽度的 10% 才视为重叠，避免边缘的细微交叠
+        widths = bbox_arr[:, 2] - bbox_arr[:, 0]
+        overlap = (np.minimum(bbox_arr[:, None, 2], bbox_arr[None, :, 2])
+                   - np.maximum(bbox_arr[:, None, 0], bbox_arr[None, :, 0]))
+        x_overlap = overlap > 0.1 * np.minimum(widths[:, None], widths[None, :])
+        np.fill_diagonal(x_overlap, False)
+        # 只与未跨过分割点的块比较，否则任何与通栏块重叠的块都会被误判为通栏
+        crosses = (bbox_arr[:, 0] < split_point) & (bbox_arr[:, 2] > split_point)
+        x_overlap[:, crosses] = False
+        spanning = crosses | ((x_overlap & ~is_right[None, :]).any(axis=1) & (x_overlap & is_right[None, :]).any(axis=1))
+        # 通栏块记为第 0 栏，与左栏一起排在堆的前面
+        columns = np.where(spanning, 0, is_right.astype(np.int64))
+
+        # precedes[i, j]: i 与 j 同栏（或其中之一为通栏块）且 i 在 j 上方，i 必须先于 j
+        related = (columns[:, None] == columns[None, :]) | spanning[:, None] | spanning[None, :]
+        precedes = related & (y_centers[:, None] < y_centers[None, :])
+        indegree = precedes.sum(axis=0)
+
+        # Kahn 拓扑排序，用堆按 (栏, y 中心) 选择下一个可读出的文本块
+        ready = [(columns[i], y_centers[i], i) for i in np.flatnonzero(indegree == 0).tolist()]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, _, i = heapq.heappop(ready)
+            order.append(i)
+            successors = np.flatnonzero(precedes[i])
+            indegree[successors] -= 1
+            for j in successors[indegree[successors] == 0].tolist():
+                heapq.heappush(ready, (columns[j], y_centers[j], j))
+
+        return '\n'.join(blocks[i]['text'] for i in order)
+
+    def _find_split_point(self, bbox_arr: np.ndarray, x_centers: np.ndarray, page_width: float) -> float:
+        """确定左右两栏的分割点：优先用两个列中心的中点，其次用页面中央区域的最大水平间隙，否则取页面中线"""
+        thr = self._page_thresholds(page_width)
+        column_centers = self._detect_columns_kmeans(x_centers, page_width, thr)
         if len(column_centers) >= 2:
-            # 如果自信地检测到两个列中心，使用它们的中间点作为分割点
-            split_point = (column_centers[0] + column_centers[1]) / 2
-            logger.debug(f"KMeans/Histogram detected split_point: {split_point:.2f}")
-        else:
-            # 备用方案：如果聚类未能找到两列，尝试寻找文本块之间的最大水平间隙
-            # 这对于 _detect_layout_type 基于 avg_width 判断为多列但聚类失败的情况尤其重要
-
-            # 收集所有文本块的 x0 和 x1 坐标
-            x_coords = sorted([block['x0'] for block in blocks] + [block['x1'] for block in blocks])
-
-            max_gap = 0
-            potential_split_point = page_width / 2  # 备用分割点，如果未找到显著间隙
-
-            # 遍历排序后的 x 坐标，寻找最大的间隙
-            for i in range(len(x_coords) - 1):
-                gap = x_coords[i + 1] - x_coords[i]
-                # 仅考虑页面中央区域的间隙，避免边缘的空白
-                if gap > max_gap and page_width * 0.3 < x_coords[i] < page_width * 0.7:
-                    max_gap = gap
-                    potential_split_point = (x_coords[i] + x_coords[i + 1]) / 2
-
-            # 如果找到一个显著的间隙，则使用它作为分割点
-            # 显著性定义：间隙宽度大于页面宽度的5%
-            if max_gap > page_width * 0.05:
-                split_point = potential_split_point
-                logger.debug(f"Largest gap detected split_point: {split_point:.2f} (max_gap: {max_gap:.2f})")
-            else:
-                logger.debug(f"No significant gap found, using default split_point: {split_point:.2f}")
-
-        # 根据确定的分割点将文本块分配到左右列
-        left_blocks = []
-        right_blocks = []
-
-        for block in blocks:
-            block_center = (block['x0'] + block['x1']) / 2
-            if block_center < split_point:
-                left_blocks.append(block)
-            else:
-                right_blocks.append(block)
-
-        # 按y坐标排序
-        left_blocks.sort(key=lambda x: x['y0'])
-        right_blocks.sort(key=lambda x: x['y0'])
-
-        # 合并文本（先左列，再右列）
-        result = []
-        if left_blocks:
-            result.extend([block['text'] for block in left_blocks])
-        if right_blocks:
-            result.extend([block['text'] for block in right_blocks])
-
-        return '\n'.join(result)
+            left, right = column_centers[0], column_centers[1]
+            # 列中心会被宽度参差的段落拉偏，因此在两列中心之间选择被文本块跨过最少的位置作为分割点，
+            # 即栏间空白；并列时取最靠近两列中心中点的位置
+            edges = np.sort(np.concatenate([bbox_arr[:, 0], bbox_arr[:, 2]]))
+            edges = edges[(edges > left) & (edges < right)]
+            candidates = np.concatenate([[(left + right) / 2], 0.5 * (edges[:-1] + edges[1:])])
+            crossings = ((bbox_arr[None, :, 0] < candidates[:, None])
+                         & (bbox_arr[None, :, 2] > candidates[:, None])).sum(axis=1)
+            best = np.flatnonzero(crossings == crossings.min())
+            return float(candidates[best[np.argmin(np.abs(candidates[best] - (left + right) / 2))]])
+
+        # 聚类未能找到两列（_detect_layout_type 基于平均块宽判断为多列时），寻找文本块之间的最大水平间隙
+        x_coords = np.sort(np.concatenate([bbox_arr[:, 0], bbox_arr[:, 2]]))
+        # 仅考虑页面中央区域的间隙，避免边缘的空白
+        mid_mask = (x_coords[:-1] > thr.cs) & (x_coords[:-1] < thr.ce)
+        gaps = np.where(mid_mask, np.diff(x_coords), 0.0)
+        gap_idx = int(np.argmax(gaps)) if len(gaps) else 0
+        # 间隙宽度大于页面宽度的 5% 才认为是分栏间隙
+        if len(gaps) and gaps[gap_idx] > page_width * 0.05:
+            return float(x_coords[gap_idx] + x_coords[gap_idx + 1]) / 2
+        return page_width / 2
+
+
+def _extract_page_range(extractor: AdaptiveFitzExtractor, pdf_path: str, page_range: range) -> List[str]:
+    """在子进程中打开文档并提取一段连续页面的文本"""
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        return [extractor._extract_page_text(doc[page_num]) for page_num in page_range]
 
 
 # 使用示例
@@ -1,34 +1,63 @@
 import logging
 import math
-from typing import List
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 import pdfplumber
 import numpy as np
-from sklearn.cluster import KMeans
-import warnings
 
-from sklearn.metrics import silhouette_score
+from .clustering import kmeans_1d
 
 logging.getLogger("pdfminer.pdfpage").setLevel(logging.ERROR)
+logger = logging.getLogger(__name__)
+
+# extract_words 结果的结构化数组类型，坐标保持 float64 以免改变列划分边界上的结果
+_WORD_DTYPE = np.dtype([('x0', 'f8'), ('x1', 'f8'), ('top', 'f8'), ('text', object)])
+
+# 文档级布局探测结果缓存的最大条目数，超出时淘汰最久未使用的文档
+_LAYOUT_CACHE_SIZE = 128
 
 class AdaptivePlumberExtractor:
     def __init__(self):
         self.min_words_limit = 20
         self.silhouette_score_threshold = 0.5
         self.column_threshold = 0.3  # 列间距阈值
+        # 文档级布局探测结果的 LRU 缓存，键为 (文件绝对路径, 修改时间)
+        self._layout_cache: "OrderedDict[Tuple[str, float], bool]" = OrderedDict()
+        # 文档内列检测结果缓存，键为 _cluster_key 计算的版式特征，每个文档开始时清空
+        self._cluster_cache: Dict[tuple, List[float]] = {}
 
     def extract_text(self, pdf_path: str, max_columns: int = 2) -> str:
+        self._cluster_cache.clear()
         with pdfplumber.open(pdf_path) as pdf:
+            double_column_layout = self._detect_document_layout(pdf_path, pdf.pages)
+            logger.debug("Recognized multi-column layout: %s, max_columns: %s", double_column_layout, max_columns)
+            # 文档级探测结果直接用于每一页，单栏文档的页面不再做聚类
             extract_texts = []
-            double_column_layout = self._is_multi_column_layout(pdf.pages)
-            max_columns = 2 if double_column_layout else 1
-            print(f"Recognized multi-column layout: {double_column_layout}, max_columns: {max_columns}")
-#            for page in pdf.pages:
-            if pdf.pages and len(pdf.pages) > 0:
-                page = pdf.pages[0]
-                extract_texts.append(self._extract_text_from_multi_column_auto(page, max_columns))
+            for page in pdf.pages:
+                extract_texts.append(
+                    self._extract_text_from_multi_column_auto(page, max_columns, precomputed_layout=double_column_layout))
+                page.close()  # 释放已解析页面的缓存，避免长文档内存持续增长
             return "\n\n".join(extract_texts)
 
+    def _detect_document_layout(self, pdf_path, pages: List[pdfplumber.page.Page]) -> bool:
+        """探测文档是否为多栏布局，同一文件（未被修改时）只探测一次；文件对象等非路径输入不缓存"""
+        if not isinstance(pdf_path, (str, os.PathLike)):
+            return self._is_multi_column_layout(pages)
+        try:
+            cache_key = (os.path.abspath(pdf_path), os.path.getmtime(pdf_path))
+        except OSError:
+            return self._is_multi_column_layout(pages)
+
+        if cache_key in self._layout_cache:
+            self._layout_cache.move_to_end(cache_key)
+            return self._layout_cache[cache_key]
+        is_multi_column = self._is_multi_column_layout(pages)
+        self._layout_cache[cache_key] = is_multi_column
+        if len(self._layout_cache) > _LAYOUT_CACHE_SIZE:
+            self._layout_cache.popitem(last=False)
+        return is_multi_column
 
     def _is_multi_column_layout(self, pages: List[pdfplumber.page.Page]) -> bool:
         num_pages = len(pages)
@@ -39,20 +68,22 @@ class AdaptivePlumberExtractor:
             target_num = math.ceil(num_pages / 2)
         try:
             is_double_column = bool(pages[target_num].extract_table(dict(vertical_strategy='text', text_tolerance=12)))
-            print(f"num_pages: {num_pages}, target_num: {target_num}, is_double_column: {is_double_column}")
+            logger.debug("num_pages: %s, target_num: %s, is_double_column: %s", num_pages, target_num, is_double_column)
         except Exception as e:
-            print(f"error : {str(e)}")
+            logger.warning("error : %s", e)
             is_double_column = False
         return is_double_column
 
 
-    def _extract_text_from_multi_column_auto(self, page: pdfplumber.page.Page, max_columns: int = 2) -> str:
+    def _extract_text_from_multi_column_auto(self, page: pdfplumber.page.Page, max_columns: int = 2,
+                                             precomputed_layout: Optional[bool] = None) -> str:
         """
         使用 K-Means 聚类和轮廓系数自动检测并提取多栏页面的文本。
 
         Args:
             page: 一个 pdfplumber.page.Page 对象。
             max_columns: 考虑的最大列数，默认为 3。函数将自动从 1 到 max_columns 中选择最佳列数。
+            precomputed_layout: 文档级探测得到的布局（是否多栏）。为 False 时直接按单栏提取，跳过聚类。
 
         Returns:
             提取并正确排序后的文本。
@@ -60,36 +91,83 @@ class AdaptivePlumberExtractor:
         # 1. 获取单词
         words = page.extract_words(x_tolerance=3, y_tolerance=3, keep_blank_chars=False)
 
-        if not words or max_columns < 2:
-            return page.extract_text() or ""
+        # 后续所有文本都由 words 重建，避免 extract_text / crop 再次解析页面字符流
+        if not words or max_columns < 2 or precomputed_layout is False:
+            return self._words_to_text(words)
 
         # 如果单词太少，很可能是单栏或者空页面，直接默认处理
         if len(words) < self.min_words_limit:
-            print("单词数量过少，使用默认单栏提取方式。")
-            # 使用 extract_text 并设置容差，比手动排序单词更稳健
-            return page.extract_text(x_tolerance=3, y_tolerance=3) or ""
+            logger.debug("单词数量过少，使用默认单栏提取方式。")
+            return self._words_to_text(words)
+
+        # 2. 准备聚类数据：一次性转为结构化数组，后续中心计算与排序都在数组上完成
+        word_arr = self._words_to_array(words)
+        word_centers = (word_arr['x0'] + word_arr['x1']) * 0.5
+
+        # 3. 检测列中心；同一文档中版式特征相同的页面直接复用之前的检测结果
+        cache_key = self._cluster_key(word_centers, page.width, max_columns)
+        column_centers = self._cluster_cache.get(cache_key)
+        if column_centers is None:
+            column_centers = self._detect_column_centers(np.sort(word_centers), page.width, max_columns)
+            self._cluster_cache[cache_key] = column_centers
+
+        # 4. 如果检测为单栏，直接按单栏处理
+        if not column_centers:
+            order = np.lexsort((word_arr['x0'], word_arr['top']))
+            return " ".join(word_arr['text'][order].tolist())
+
+        # 5. 按检测到的多栏布局进行处理
+        n_columns = len(column_centers)
+        logger.debug("布局检测为 %s 栏，开始处理...", n_columns)
+
+        split_points = [0] + [(column_centers[i] + column_centers[i + 1]) / 2 for i in range(len(column_centers) - 1)] + [
+            page.width]
+
+        # 按单词中心所在的区间分配到各栏
+        col_indices = np.digitize(word_centers, split_points[1:-1])
+        column_words = [[] for _ in range(n_columns)]
+        for word, col_idx in zip(words, col_indices.tolist()):
+            column_words[col_idx].append(word)
+
+        all_text_columns = []
+        for col_words in column_words:
+            col_text = self._words_to_text(col_words)
+            if col_text:
+                all_text_columns.append(col_text)
 
-        # 2. 准备聚类数据
-        x_centers = np.array([(word['x0'] + word['x1']) / 2 for word in words]).reshape(-1, 1)
+        return "\n\n".join(all_text_columns)
 
-        # 3. 寻找最佳列数 (k)
+    def _detect_column_centers(self, x_centers: np.ndarray, page_width: float, max_columns: int) -> List[float]:
+        """
+        对升序排列的单词 x 中心做一维聚类，选择最佳列数并检查列间距。
+
+        Returns:
+            各栏的列中心（升序）；判定为单栏时返回空列表。
+        """
+        # 寻找最佳列数 (k)
         # 我们测试从 2 到 max_columns 的每一种可能性，并用轮廓系数评估效果。
         # 轮廓系数不能用于 k=1 的情况，所以我们从 k=2 开始。
         scores = {}
+        candidates = {}
         # 确保测试的列数不超过 (单词数 - 1)
         actual_max_columns = min(max_columns, len(x_centers) - 1)
 
         if actual_max_columns >= 2:
+            # 一次动态规划得到所有候选 k 的最优划分
+            candidates = kmeans_1d(x_centers, actual_max_columns)
+            # 只有 k=2 一个候选时，列间距检查不通过则结果必为单栏，无需再计算轮廓系数
+            if actual_max_columns == 2 and not self._is_well_separated(
+                    self._column_centers(x_centers, candidates[2]), page_width):
+                logger.debug("多栏检测结果不显著 (列间距过小)，回退至单栏提取方式。")
+                return []
             for k in range(2, actual_max_columns + 1):
-                with warnings.catch_warnings():
-                    warnings.simplefilter("ignore", UserWarning)
-                    kmeans = KMeans(n_clusters=k, random_state=42, n_init=10).fit(x_centers)
+                bounds = candidates[k]
 
                 # 确保形成了多个簇，才能计算轮廓系数
-                if len(set(kmeans.labels_)) > 1:
-                    score = silhouette_score(x_centers, kmeans.labels_)
+                if len(bounds) > 2:
+                    score = self._silhouette_1d(x_centers, bounds)
                     scores[k] = score
-                    print(f"测试 {k} 栏布局, 轮廓系数: {score:.4f}")
+                    logger.debug("测试 %s 栏布局, 轮廓系数: %.4f", k, score)
                 else:
                     # 如果所有点都被分到同一个簇，说明不适合多栏
                     scores[k] = -1  # 给一个很差的分数
@@ -104,52 +182,101 @@ class AdaptivePlumberExtractor:
         else:
             best_k = 1
 
-        # 4. 如果最佳候选是单栏，直接按单栏处理
         if best_k == 1:
-            print("布局检测为单栏，使用默认提取方式。")
-            sorted_words = sorted(words, key=lambda w: (w['top'], w['x0']))
-            return " ".join(w['text'] for w in sorted_words)
-
-        # 5. 对最佳的多栏候选 (best_k > 1)，进行最终的合理性检查
-        print(f"最佳列数候选: {best_k}，进行合理性检查...")
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", UserWarning)
-            kmeans = KMeans(n_clusters=best_k, random_state=42, n_init=10).fit(x_centers)
-
-        column_centers = sorted(kmeans.cluster_centers_.flatten())
-        print(f"column_centers: {column_centers}")
-        # 检查列中心是否靠得太近
-        min_separation = page.width * self.column_threshold
-        print(f"min_separation: {min_separation}")
-
-        is_well_separated = True
-        if len(column_centers) > 1:
-            for i in range(len(column_centers) - 1):
-                if (column_centers[i + 1] - column_centers[i]) < min_separation:
-                    is_well_separated = False
-                    break
-        else:
-            is_well_separated = False
+            logger.debug("布局检测为单栏，使用默认提取方式。")
+            return []
+
+        # 对最佳的多栏候选 (best_k > 1)，进行最终的合理性检查
+        logger.debug("最佳列数候选: %s，进行合理性检查...", best_k)
+        column_centers = self._column_centers(x_centers, candidates[best_k])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("column_centers: %s", [round(c, 2) for c in column_centers])
 
         # 如果检查不通过，回退到单栏模式
-        if not is_well_separated:
-            print("多栏检测结果不显著 (列间距过小)，回退至单栏提取方式。")
-            sorted_words = sorted(words, key=lambda w: (w['top'], w['x0']))
-            return " ".join(w['text'] for w in sorted_words)
+        if not self._is_well_separated(column_centers, page_width):
+            logger.debug("多栏检测结果不显著 (列间距过小)，回退至单栏提取方式。")
+            return []
 
-        # 6. 如果所有检查都通过，则按检测到的多栏布局进行处理
-        n_columns = best_k
-        print(f"布局检测为 {n_columns} 栏，开始处理...")
+        return column_centers
 
-        split_points = [0] + [(column_centers[i] + column_centers[i + 1]) / 2 for i in range(len(column_centers) - 1)] + [
-            page.width]
+    @staticmethod
+    def _column_centers(x_centers: np.ndarray, bounds: List[int]) -> List[float]:
+        """由划分边界计算各簇的中心（升序）"""
+        return [float(x_centers[bounds[i]:bounds[i + 1]].mean()) for i in range(len(bounds) - 1)]
 
-        all_text_columns = []
-        for i in range(n_columns):
-            col_bbox = (split_points[i], page.bbox[1], split_points[i + 1], page.bbox[3])
-            column_page = page.crop(col_bbox)
-            col_text = column_page.extract_text(x_tolerance=3, y_tolerance=3)
-            if col_text:
-                all_text_columns.append(col_text)
+    def _is_well_separated(self, column_centers: List[float], page_width: float) -> bool:
+        """检查列中心是否靠得太近：至少两列，且相邻列中心距离不小于 page_width * column_threshold"""
+        if len(column_centers) < 2:
+            return False
+        min_separation = page_width * self.column_threshold
+        return all(right - left >= min_separation for left, right in zip(column_centers, column_centers[1:]))
 
-        return "\n\n".join(all_text_columns)
+    @staticmethod
+    def _cluster_key(x_centers: np.ndarray, page_width: float, max_columns: int) -> tuple:
+        """版式特征：x 中心在页面宽度上的 32 档直方图，特征相同的页面共享列检测结果"""
+        hist = np.histogram(x_centers, bins=32, range=(0, page_width))[0]
+        return (round(float(page_width), 1), max_columns, len(x_centers), tuple(hist.tolist()))
+
+    @staticmethod
+    def _words_to_array(words: List[dict]) -> np.ndarray:
+        """将 extract_words 的结果转为 (x0, x1, top, text) 结构化数组"""
+        return np.fromiter(((w['x0'], w['x1'], w['top'], w['text']) for w in words), dtype=_WORD_DTYPE,
+                           count=len(words))
+
+    @staticmethod
+    def _words_to_text(words: List[dict], y_tolerance: float = 3) -> str:
+        """
+        将 extract_words 的结果按行重建为文本，行划分与 pdfplumber 的 extract_text(y_tolerance=3) 一致：
+        对去重后的 top 值升序做链式聚类（与上一个值相差不超过 y_tolerance 即归入同一行），
+        行内保持单词的提取顺序并以空格连接，行之间以换行连接。
+        """
+        if not words:
+            return ""
+
+        # 与 pdfplumber.utils.cluster_objects 相同：相邻 top 逐个比较，而不是与行首比较
+        line_of_top = {}
+        line = 0
+        last_top = None
+        for top in sorted({w['top'] for w in words}):
+            if last_top is not None and top > last_top + y_tolerance:
+                line += 1
+            line_of_top[top] = line
+            last_top = top
+
+        lines = [[] for _ in range(line + 1)]
+        for word in words:
+            lines[line_of_top[word['top']]].append(word['text'])
+        return "\n".join(" ".join(line_words) for line_words in lines)
+
+    @staticmethod
+    def _silhouette_1d(xs: np.ndarray, bounds: List[int]) -> float:
+        """
+        计算一维连续簇的平均轮廓系数，与 sklearn.metrics.silhouette_score 结果一致。
+        利用前缀和在 O(N·k) 内求出每个点到各簇的平均距离，避免 O(N²) 的距离矩阵。
+        """
+        n = len(xs)
+        ps = np.concatenate(([0.0], np.cumsum(xs)))
+        idx = np.arange(n)
+        a = np.zeros(n)
+        b = np.full(n, np.inf)
+        sizes = np.zeros(n)
+        for c in range(len(bounds) - 1):
+            lo, hi = bounds[c], bounds[c + 1]
+            size = hi - lo
+            total = ps[hi] - ps[lo]
+            # 簇内：左侧点与右侧点分别用前缀和求距离和
+            own = slice(lo, hi)
+            x = xs[own]
+            left = x * (idx[own] - lo) - (ps[lo + 1:hi + 1] - x - ps[lo])
+            right = (ps[hi] - ps[lo + 1:hi + 1]) - x * (hi - 1 - idx[own])
+            sizes[own] = size
+            if size > 1:
+                a[own] = (left + right) / (size - 1)
+            # 簇外：其他簇整体位于该点的一侧
+            before, after = slice(0, lo), slice(hi, n)
+            b[before] = np.minimum(b[before], (total - xs[before] * size) / size)
+            b[after] = np.minimum(b[after], (xs[after] * size - total) / size)
+
+        denom = np.maximum(a, b)
+        s = np.where((sizes > 1) & (denom > 0), (b - a) / np.where(denom > 0, denom, 1.0), 0.0)
+        return float(s.mean())
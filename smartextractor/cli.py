@@ -34,9 +34,10 @@ def main():
 @click.option('--enable-tables/--disable-tables', default=True, help='Enable/Disable table extraction')
 @click.option('--confidence', type=float, default=0.8, help='Confidence threshold')
 @click.option('--workers', type=int, default=4, help='Number of parallel workers')
+@click.option('--fast', is_flag=True, help='Only extract the text layer when the PDF has one')
 @click.option('--verbose', '-v', is_flag=True, help='Verbose output')
 def extract(pdf_path, output, output_format, language, enable_ocr, 
-           enable_layout, enable_tables, confidence, workers, verbose):
+           enable_layout, enable_tables, confidence, workers, fast, verbose):
     """Extract text content from PDF"""
     
     # Set log level
@@ -56,6 +57,7 @@ def extract(pdf_path, output, output_format, language, enable_ocr,
             language=language,
             confidence_threshold=confidence,
             max_workers=workers,
+            fast_text_only=fast,
             output_format=output_format
         )
         
@@ -64,6 +66,13 @@ def extract(pdf_path, output, output_format, language, enable_ocr,
         
         # Extract content
         logger.info(f"Start extracting PDF: {pdf_path}")
+        if output and output_format == 'text':
+            # Write page text to the file as extraction proceeds instead of building it in memory
+            with open(output, 'w', encoding='utf-8', buffering=1 << 20) as output_stream:
+                extractor.extract(pdf_path, output_stream=output_stream)
+            logger.info(f"Result saved to: {output}")
+            return
+        
         result = extractor.extract(pdf_path)
         
         # Output result
@@ -81,23 +90,69 @@ def extract(pdf_path, output, output_format, language, enable_ocr,
         sys.exit(1)
 
 
+@main.command('extract-batch')
+@click.argument('input_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('-o', '--output-dir', type=click.Path(file_okay=False), required=True, help='Output directory')
+@click.option('--format', 'output_format',
+              type=click.Choice(['text', 'json']),
+              default='text', help='Output format')
+@click.option('--enable-ocr/--disable-ocr', default=True, help='Enable/Disable OCR')
+@click.option('--workers', type=int, default=4, help='Number of parallel workers')
+@click.option('--fast', is_flag=True, help='Only extract the text layer when the PDF has one')
+def extract_batch(input_dir, output_dir, output_format, enable_ocr, workers, fast):
+    """Extract text content from every PDF in a directory"""
+    config = ExtractionConfig(
+        enable_ocr=enable_ocr,
+        max_workers=workers,
+        fast_text_only=fast,
+        output_format=output_format
+    )
+    os.makedirs(output_dir, exist_ok=True)
+    suffix = '.txt' if output_format == 'text' else '.json'
+    failed = 0
+    
+    # One extractor for the whole batch, so the worker pool and processors are set up once
+    with SmartExtractor(config) as extractor:
+        for pdf_file in sorted(Path(input_dir).glob('*.pdf')):
+            output = os.path.join(output_dir, pdf_file.stem + suffix)
+            try:
+                if output_format == 'text':
+                    with open(output, 'w', encoding='utf-8', buffering=1 << 20) as output_stream:
+                        extractor.extract(str(pdf_file), output_stream=output_stream)
+                else:
+                    extractor.extract(str(pdf_file)).save_json(output)
+                logger.info(f"Result saved to: {output}")
+            except SmartExtractorError as e:
+                logger.error(f"Extraction failed for {pdf_file}: {e}")
+                failed += 1
+    
+    if failed:
+        sys.exit(1)
+
+
 @main.command()
 @click.argument('pdf_path', type=click.Path(exists=True))
 def info(pdf_path):
     """Show PDF file information"""
     try:
+        # Read the settings from the config directly, no extractor or processor is needed
         config = ExtractionConfig()
-        extractor = SmartExtractor(config)
+        languages = SmartExtractor.static_supported_languages(config.ocr_engine) if config.enable_ocr else []
         
-        # Get processing stats
-        stats = extractor.get_processing_stats()
+        # Prescan with PyMuPDF: page count and pages whose text layer is too thin (likely scanned)
+        import fitz  # PyMuPDF
+        with fitz.open(pdf_path) as doc:
+            num_pages = doc.page_count
+            scanned_pages = sum(1 for page in doc if len(page.get_text().strip()) < 50)
         
         click.echo(f"PDF file: {pdf_path}")
         click.echo(f"File size: {os.path.getsize(pdf_path)} bytes")
-        click.echo(f"OCR enabled: {'Yes' if stats['ocr_enabled'] else 'No'}")
-        click.echo(f"Layout detection: {'Yes' if stats['layout_detection_enabled'] else 'No'}")
-        click.echo(f"Table extraction: {'Yes' if stats['table_extraction_enabled'] else 'No'}")
-        click.echo(f"Supported languages: {', '.join(stats['supported_languages'])}")
+        click.echo(f"Pages: {num_pages}")
+        click.echo(f"Pages without text layer: {scanned_pages}/{num_pages}")
+        click.echo(f"OCR enabled: {'Yes' if config.enable_ocr else 'No'}")
+        click.echo(f"Layout detection: {'Yes' if config.enable_layout_detection else 'No'}")
+        click.echo(f"Table extraction: {'Yes' if config.enable_table_extraction else 'No'}")
+        click.echo(f"Supported languages: {', '.join(languages)}")
         
     except Exception as e:
         logger.error(f"Failed to get info: {e}")
@@ -109,9 +164,7 @@ def languages():
     """Show supported languages"""
     try:
         config = ExtractionConfig()
-        extractor = SmartExtractor(config)
-        
-        languages = extractor.get_supported_languages()
+        languages = SmartExtractor.static_supported_languages(config.ocr_engine)
         
         click.echo("Supported languages:")
         for lang in languages:
@@ -138,7 +191,10 @@ def _print_result(result, output_format: str):
     if output_format == 'text':
         click.echo(result.text)
     elif output_format == 'json':
-        click.echo(result.to_json())
+        # Write the encoded JSON directly to skip the text layer re-encoding
+        sys.stdout.buffer.write(result.to_json_bytes())
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.flush()
     elif output_format == 'structured':
         # Print structured info
         click.echo(f"Text length: {len(result.text)} characters")
@@ -0,0 +1,79 @@
+"""
+Clustering Utilities - Exact one-dimensional k-means shared by the layout detectors
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def kmeans_1d(xs: np.ndarray, max_k: int) -> Dict[int, List[int]]:
+    """
+    Exact 1-D k-means (Wang & Song, 2011) for every k = 1..max_k in one dynamic program
+
+    In 1-D the optimal clusters are contiguous runs of the sorted data, so layer m of the
+    table holds the best split into m + 1 clusters and all candidate k share one table.
+
+    Args:
+        xs: Values sorted in ascending order
+        max_k: Largest number of clusters to solve for (capped at len(xs))
+
+    Returns:
+        {k: bounds}, where bounds = [0, b1, ..., n] and cluster i is xs[bounds[i]:bounds[i + 1]].
+        Equal values are never split across clusters, so a result may have fewer than k clusters.
+    """
+    n = len(xs)
+    max_k = min(max_k, n)
+    # Center the data to reduce the rounding error of the prefix sums of squares
+    centered = xs - xs.mean()
+    ps = np.concatenate(([0.0], np.cumsum(centered)))
+    ps2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+
+    def sse(i: int, starts: np.ndarray) -> np.ndarray:
+        """Within-cluster sum of squares of xs[j:i] for every j in starts"""
+        cnt = i - starts
+        seg = ps[i] - ps[starts]
+        return (ps2[i] - ps2[starts]) - seg * seg / cnt
+
+    # dp[m][i]: lowest cost of splitting the first i values into m + 1 clusters
+    dp = np.full((max_k, n + 1), np.inf)
+    back = np.zeros((max_k, n + 1), dtype=np.int64)
+    dp[0, 1:] = ps2[1:] - ps[1:] * ps[1:] / np.arange(1, n + 1)
+    for m in range(1, max_k):
+        # The last layer is only needed for i = n
+        for i in (range(m + 1, n + 1) if m < max_k - 1 else (n,)):
+            starts = np.arange(m, i)
+            costs = dp[m - 1, starts] + sse(i, starts)
+            j = int(np.argmin(costs))
+            dp[m, i] = costs[j]
+            back[m, i] = starts[j]
+
+    results = {}
+    for k in range(1, max_k + 1):
+        bounds = [n]
+        i = n
+        for m in range(k - 1, 0, -1):
+            i = int(back[m, i])
+            bounds.append(i)
+        bounds.append(0)
+        bounds.reverse()
+        # Drop bounds that fall between equal values, which would leave empty or overlapping clusters
+        results[k] = [0] + [b for b in bounds[1:-1] if xs[b - 1] < xs[b]] + [n]
+    return results
+
+
+def two_means_1d(values: Sequence[float]) -> Optional[Tuple[float, float]]:
+    """
+    Optimal 2-means clustering of unsorted 1-D values
+
+    Returns:
+        (left center, right center), or None if the values cannot form two distinct clusters
+    """
+    xs = np.sort(np.asarray(values, dtype=np.float64).ravel())
+    if len(xs) < 2:
+        return None
+    bounds = kmeans_1d(xs, 2)[2]
+    if len(bounds) < 3:
+        return None
+    split = bounds[1]
+    return float(xs[:split].mean()), float(xs[split:].mean())
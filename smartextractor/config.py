@@ -2,11 +2,15 @@
 Configuration Module - Define SmartExtractor configuration options
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 
+# dataclass(slots=True) is only available on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(frozen=True, **_SLOTS)
 class ExtractionConfig:
     """PDF Text Extraction Configuration Class"""
     
@@ -15,6 +19,7 @@ class ExtractionConfig:
     ocr_engine: str = "auto"  # "tesseract", "easyocr", "auto"
     language: str = "zh-CN"
     confidence_threshold: float = 0.8
+    ocr_text_threshold: int = 200  # Skip OCR when the text layer averages more characters per page
     
     # Layout detection configuration
     enable_layout_detection: bool = True
@@ -38,7 +43,9 @@ class ExtractionConfig:
     fix_encoding: bool = True
     
     # Performance configuration
+    fast_text_only: bool = False  # Only extract the text layer (no layout/table/image/OCR) when it is sufficient
     max_workers: int = 4
+    parallel_page_threshold: int = 20  # Only use worker processes for documents with more pages than this
     chunk_size: int = 10  # Number of pages processed per batch
     timeout: int = 300  # Timeout in seconds
     
@@ -48,7 +55,7 @@ class ExtractionConfig:
     include_images: bool = False
     
     # Advanced configuration
-    custom_ocr_config: Dict[str, Any] = field(default_factory=dict)
+    custom_ocr_config: Dict[str, Any] = field(default_factory=dict, hash=False)
     layout_model_path: Optional[str] = None
     table_model_path: Optional[str] = None
     
@@ -57,6 +64,9 @@ class ExtractionConfig:
         if not 0.0 <= self.confidence_threshold <= 1.0:
             raise ValueError("confidence_threshold must be between 0.0 and 1.0")
         
+        if self.ocr_text_threshold < 0:
+            raise ValueError("ocr_text_threshold must be non-negative")
+        
         if self.ocr_engine not in ["tesseract", "easyocr", "auto"]:
             raise ValueError("ocr_engine must be 'tesseract', 'easyocr' or 'auto'")
         
@@ -69,6 +79,9 @@ class ExtractionConfig:
         if self.max_workers < 1:
             raise ValueError("max_workers must be greater than 0")
         
+        if self.parallel_page_threshold < 1:
+            raise ValueError("parallel_page_threshold must be greater than 0")
+        
         if self.chunk_size < 1:
             raise ValueError("chunk_size must be greater than 0")
         
@@ -76,7 +89,7 @@ class ExtractionConfig:
             raise ValueError("timeout must be greater than 0")
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class OCRConfig:
     """OCR Engine Configuration"""
     
@@ -92,10 +105,10 @@ class OCRConfig:
     
     # Tesseract specific configuration
     tesseract_path: Optional[str] = None
-    tesseract_config: Dict[str, str] = field(default_factory=dict)
+    tesseract_config: Dict[str, str] = field(default_factory=dict, hash=False)
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class LayoutConfig:
     """Layout Detection Configuration"""
     
@@ -115,7 +128,7 @@ class LayoutConfig:
     confidence_threshold: float = 0.7
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class TableConfig:
     """Table Extraction Configuration"""
     
@@ -2,11 +2,18 @@
 Core Module - Main implementation of SmartExtractor
 """
 
+import io
+import multiprocessing
 import os
+import sys
 import time
+import weakref
+from contextlib import nullcontext
+from functools import cached_property
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from concurrent.futures import ProcessPoolExecutor
 
 from loguru import logger
 
@@ -18,17 +25,16 @@ from .exceptions import (
     OCRError, LayoutDetectionError, TableExtractionError, ImageProcessingError,
     ValidationError, UnsupportedFormatError
 )
-from .processors.pdf_processor import PDFProcessor
-from .processors.ocr_processor import OCRProcessor
-from .processors.layout_processor import LayoutProcessor
-from .processors.table_processor import TableProcessor
-from .processors.image_processor import ImageProcessor
-from .processors.text_processor import TextProcessor
 
 
 class SmartExtractor:
     """Intelligent PDF Text Extractor"""
     
+    # Processors hold no per-run state, so extractors with equal configs share them
+    # (and any models they load); keyed by (processor class, config). Entries are weak,
+    # so a processor is released once no extractor uses it any more
+    _processor_cache: "weakref.WeakValueDictionary[tuple, Any]" = weakref.WeakValueDictionary()
+    
     def __init__(self, config: Optional[ExtractionConfig] = None):
         """
         Initialize SmartExtractor
@@ -38,24 +44,87 @@ class SmartExtractor:
         """
         self.config = config or ExtractionConfig()
         
-        # Initialize processors
-        self._init_processors()
+        # Processors are imported and initialized lazily on first access
+        
+        # Worker pool for parallel page processing, created on first use and kept until close()
+        # (or until the extractor is garbage collected, see _get_page_executor)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_finalizer: Optional[weakref.finalize] = None
         
         logger.info("SmartExtractor initialized")
     
-    def _init_processors(self):
-        """Initialize all processors"""
-        try:
-            self.pdf_processor = PDFProcessor(self.config)
-            self.ocr_processor = OCRProcessor(self.config) if self.config.enable_ocr else None
-            self.layout_processor = LayoutProcessor(self.config) if self.config.enable_layout_detection else None
-            self.table_processor = TableProcessor(self.config) if self.config.enable_table_extraction else None
-            self.image_processor = ImageProcessor(self.config) if self.config.enable_image_processing else None
-            self.text_processor = TextProcessor(self.config) if self.config.enable_text_cleaning else None
-            
-        except Exception as e:
-            logger.error(f"Processor initialization failed: {e}")
-            raise ConfigurationError(f"Processor initialization failed: {e}")
+    def __enter__(self) -> "SmartExtractor":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Shut down the worker pool used for parallel page processing"""
+        if self._executor is not None:
+            # Calling the finalizer shuts the pool down and detaches it
+            self._executor_finalizer()
+            self._executor = None
+            self._executor_finalizer = None
+    
+    def _init_processor(self, processor_class):
+        """Initialize a processor, reusing the one built for an equal config if any"""
+        cache_key = (processor_class, self.config)
+        processor = self._processor_cache.get(cache_key)
+        if processor is None:
+            try:
+                processor = processor_class(self.config)
+            except Exception as e:
+                logger.error(f"Processor initialization failed: {e}")
+                raise ConfigurationError(f"Processor initialization failed: {e}")
+            self._processor_cache[cache_key] = processor
+        return processor
+    
+    @cached_property
+    def pdf_processor(self):
+        """PDF processor"""
+        from .processors.pdf_processor import PDFProcessor
+        return self._init_processor(PDFProcessor)
+    
+    @cached_property
+    def ocr_processor(self):
+        """OCR processor, None if OCR is disabled"""
+        if not self.config.enable_ocr:
+            return None
+        from .processors.ocr_processor import OCRProcessor
+        return self._init_processor(OCRProcessor)
+    
+    @cached_property
+    def layout_processor(self):
+        """Layout processor, None if layout detection is disabled"""
+        if not self.config.enable_layout_detection:
+            return None
+        from .processors.layout_processor import LayoutProcessor
+        return self._init_processor(LayoutProcessor)
+    
+    @cached_property
+    def table_processor(self):
+        """Table processor, None if table extraction is disabled"""
+        if not self.config.enable_table_extraction:
+            return None
+        from .processors.table_processor import TableProcessor
+        return self._init_processor(TableProcessor)
+    
+    @cached_property
+    def image_processor(self):
+        """Image processor, None if image processing is disabled"""
+        if not self.config.enable_image_processing:
+            return None
+        from .processors.image_processor import ImageProcessor
+        return self._init_processor(ImageProcessor)
+    
+    @cached_property
+    def text_processor(self):
+        """Text processor, None if text cleaning is disabled"""
+        if not self.config.enable_text_cleaning:
+            return None
+        from .processors.text_processor import TextProcessor
+        return self._init_processor(TextProcessor)
     
     def extract_text(self, pdf_path: str) -> str:
         """
@@ -70,17 +139,21 @@ class SmartExtractor:
         result = self.extract(pdf_path)
         return result.text
     
-    def extract(self, pdf_path: str) -> ExtractionResult:
+    def extract(self, pdf_path: str, output_stream: Optional[TextIO] = None) -> ExtractionResult:
         """
         Extract PDF content (full version)
         
         Args:
             pdf_path: PDF file path
+            output_stream: Optional text stream; if given, the text of each page is written
+                to it as soon as the page is processed, cleaned to the same text as the
+                non-streamed result
             
         Returns:
-            Full extraction result
+            Full extraction result; when output_stream is given, a summary without
+            text and pages (metadata["text_length"] holds the number of characters written)
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             # Validate file
@@ -91,17 +164,20 @@ class SmartExtractor:
             # 1. Parse PDF structure
             pdf_data = self.pdf_processor.process(pdf_path)
             
-            # 2. Process each page
-            pages = self._process_pages(pdf_data)
-            
-            # 3. Merge results
-            result = self._merge_results(pages, pdf_data.metadata)
+            # 2-3. Process each page and merge the results as pages arrive
+            has_text_layer = self._has_text_layer(pdf_data) if self.config.fast_text_only else None
+            if has_text_layer:
+                # Native text PDF: the text layer alone is enough
+                page_results = self._iter_text_layer_pages(pdf_data)
+            else:
+                page_results = self._iter_page_results(pdf_data, has_text_layer)
+            result = self._merge_results(page_results, pdf_data.metadata, output_stream)
             
-            # 4. Post-process
-            if self.text_processor:
+            # 4. Post-process (streamed text has already been cleaned while writing)
+            if self.text_processor and output_stream is None:
                 result = self.text_processor.post_process(result)
             
-            processing_time = time.time() - start_time
+            processing_time = time.perf_counter() - start_time
             result.processing_time = processing_time
             
             logger.info(f"PDF processing completed, time used: {processing_time:.2f} seconds")
@@ -115,6 +191,32 @@ class SmartExtractor:
             logger.error(f"PDF processing failed: {e}")
             raise SmartExtractorError(f"PDF processing failed: {e}")
     
+    def iter_pages(self, pdf_path: str) -> Iterator[PageResult]:
+        """
+        Extract PDF content page by page as a stream
+        
+        Pages are processed config.chunk_size at a time, so callers that consume
+        each page as it arrives do not hold the whole document in memory.
+        
+        Args:
+            pdf_path: PDF file path
+            
+        Yields:
+            Extraction result for each page, in page order
+        """
+        try:
+            self._validate_pdf_file(pdf_path)
+            
+            pdf_data = self.pdf_processor.process(pdf_path)
+            yield from self._iter_page_results(pdf_data)
+            
+        except (PDFNotFoundError, PDFCorruptedError, PDFPasswordProtectedError, OCRError, LayoutDetectionError, TableExtractionError, ImageProcessingError, ConfigurationError, ValidationError, UnsupportedFormatError, ProcessingTimeoutError) as e:
+            # Re-raise specific exceptions as-is
+            raise
+        except Exception as e:
+            logger.error(f"Page extraction failed: {e}")
+            raise SmartExtractorError(f"Page extraction failed: {e}")
+    
     def extract_pages(self, pdf_path: str) -> List[PageResult]:
         """
         Extract PDF content by page
@@ -138,71 +240,168 @@ class SmartExtractor:
             logger.error(f"Page extraction failed: {e}")
             raise SmartExtractorError(f"Page extraction failed: {e}")
     
-    def _validate_pdf_file(self, pdf_path: str):
-        """Validate PDF file"""
-        if not os.path.exists(pdf_path):
+    def _validate_pdf_file(self, pdf_path: str) -> os.stat_result:
+        """Validate PDF file, returning its stat result"""
+        # A single stat() serves both the existence and the size check
+        try:
+            file_stat = os.stat(pdf_path)
+        except OSError:
             raise PDFNotFoundError(f"PDF file does not exist: {pdf_path}")
         
-        if not pdf_path.lower().endswith('.pdf'):
+        if os.path.splitext(pdf_path)[1].lower() != '.pdf':
             raise SmartExtractorError(f"File is not a PDF: {pdf_path}")
         
         # Check file size
-        file_size = os.path.getsize(pdf_path)
-        if file_size == 0:
+        if file_stat.st_size == 0:
             raise PDFCorruptedError(f"PDF file is empty: {pdf_path}")
+        
+        return file_stat
     
     def _process_pages(self, pdf_data) -> List[PageResult]:
         """Process all pages"""
-        pages = []
+        return list(self._iter_page_results(pdf_data))
+    
+    def _iter_page_results(self, pdf_data, has_text_layer: Optional[bool] = None) -> Iterator[PageResult]:
+        """
+        Process pages config.chunk_size at a time and yield their results in page order
         
-        if self.config.max_workers > 1:
-            # Multi-threaded processing
-            pages = self._process_pages_parallel(pdf_data)
-        else:
-            # Single-threaded processing
-            pages = self._process_pages_sequential(pdf_data)
+        has_text_layer is the result of _has_text_layer if the caller already computed it.
+        """
+        # Whether OCR can be skipped is decided once for the whole document
+        if has_text_layer is None and self.config.enable_ocr:
+            has_text_layer = self._has_text_layer(pdf_data)
+        run_ocr = self.config.enable_ocr and not has_text_layer
+        # Starting worker processes only pays off for long documents
+        parallel = self.config.max_workers > 1 and len(pdf_data.pages) > self.config.parallel_page_threshold
+        logger.info(f"Processing {len(pdf_data.pages)} pages")
         
-        return pages
-    
-    def _process_pages_sequential(self, pdf_data) -> List[PageResult]:
-        """Process pages sequentially"""
-        pages = []
+        executor = self._get_page_executor() if parallel else None
         
+        with self._create_progress_bar(len(pdf_data.pages)) as progress:
+            page_items = enumerate(pdf_data.pages, 1)
+            while True:
+                window = list(islice(page_items, self.config.chunk_size))
+                if not window:
+                    break
+                
+                if executor:
+                    # Multi-process processing
+                    pages = self._process_pages_parallel(window, executor)
+                else:
+                    # Single-process processing
+                    pages = self._process_pages_sequential(window)
+                
+                # OCR runs in this process after the window is processed, so workers never load an OCR model
+                if run_ocr:
+                    self._process_pages_ocr(window, pages)
+                
+                if progress is not None:
+                    progress.update(len(pages))
+                yield from pages
+    
+    def _create_progress_bar(self, total: int):
+        """Create a page progress bar on an interactive terminal, updated from the calling process only"""
+        if not sys.stderr.isatty():
+            return nullcontext()
+        try:
+            from tqdm import tqdm
+        except ImportError:
+            return nullcontext()
+        return tqdm(total=total, unit="page", leave=False)
+    
+    def _iter_text_layer_pages(self, pdf_data) -> Iterator[PageResult]:
+        """Yield page results built from the text layer only, skipping layout/table/image/OCR"""
         for page_num, page_data in enumerate(pdf_data.pages, 1):
+            yield PageResult(page_number=page_num, text_blocks=self._extract_text_blocks(page_data),
+                             width=page_data.width, height=page_data.height)
+    
+    def _has_text_layer(self, pdf_data) -> bool:
+        """Whether the text layer carries enough text to skip OCR for the whole document"""
+        # A native text layer is the common case: skipping OCR then also means
+        # the OCR engine is never initialized
+        if not pdf_data.pages:
+            return False
+        total_text_length = sum(len(obj.text) for page_data in pdf_data.pages for obj in page_data.text_objects)
+        if total_text_length / len(pdf_data.pages) > self.config.ocr_text_threshold:
+            logger.info("Text layer is sufficient, skipping OCR")
+            return True
+        return False
+    
+    def _process_pages_ocr(self, page_items: List[Tuple[int, Any]], pages: List[PageResult]):
+        """Run OCR over the pages that need it and append the results to their text blocks"""
+        if not self.ocr_processor:
+            return
+        
+        for (page_num, page_data), page_result in zip(page_items, pages):
+            if not self._needs_ocr(page_data):
+                continue
             try:
-                logger.info(f"Processing page {page_num}")
-                page_result = self._process_single_page(page_data, page_num)
-                pages.append(page_result)
-                
+                page_result.text_blocks.extend(self.ocr_processor.process_page(page_data, page_num))
             except Exception as e:
-                logger.error(f"Failed to process page {page_num}: {e}")
-                # Create empty page result
-                pages.append(PageResult(page_number=page_num))
-        
-        return pages
+                logger.error(f"OCR processing failed for page {page_num}: {e}")
     
-    def _process_pages_parallel(self, pdf_data) -> List[PageResult]:
+    def _process_pages_sequential(self, page_items: List[Tuple[int, Any]]) -> List[PageResult]:
+        """Process pages sequentially"""
+        return [self._process_page_safe(page_data, page_num) for page_num, page_data in page_items]
+    
+    def _process_pages_parallel(self, page_items: List[Tuple[int, Any]], executor) -> List[PageResult]:
         """Process pages in parallel"""
-        pages = [None] * len(pdf_data.pages)
+        page_nums, pages_data = zip(*page_items)
+        # Hand pages to workers in batches to amortize pickling/dispatch overhead,
+        # leaving ~4 batches per worker for load balancing
+        chunksize = max(1, len(page_items) // (self.config.max_workers * 4))
         
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-            # Submit tasks
-            future_to_page = {
-                executor.submit(self._process_single_page, page_data, page_num): page_num - 1
-                for page_num, page_data in enumerate(pdf_data.pages, 1)
-            }
-            
-            # Collect results
-            for future in as_completed(future_to_page):
-                page_index = future_to_page[future]
-                try:
-                    page_result = future.result()
-                    pages[page_index] = page_result
-                except Exception as e:
-                    logger.error(f"Failed to process page: {e}")
-                    pages[page_index] = PageResult(page_number=page_index + 1)
-        
-        return pages
+        # map preserves page order
+        return list(executor.map(_process_page_worker, pages_data, page_nums, chunksize=chunksize))
+    
+    def _get_page_executor(self) -> ProcessPoolExecutor:
+        """Get the executor for parallel page processing, reused across extractions until close()"""
+        # Page processing is CPU-bound, so worker processes are used to sidestep the GIL.
+        # OCR is not run in the workers (see _process_pages_ocr), so no OCR model is loaded per process.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.config.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"),
+                                                 initializer=_init_page_worker, initargs=(self.config,))
+            # Shut the workers down when the extractor is collected or at exit if close() is never called;
+            # the callback holds the pool, not the extractor
+            self._executor_finalizer = weakref.finalize(self, self._executor.shutdown)
+        return self._executor
+    
+    def _process_page_safe(self, page_data, page_num: int) -> PageResult:
+        """Process a single page, returning an empty page result if it fails"""
+        try:
+            logger.debug(f"Processing page {page_num}")
+            return self._process_single_page(page_data, page_num)
+        except Exception as e:
+            logger.error(f"Failed to process page {page_num}: {e}")
+            # Create empty page result
+            return PageResult(page_number=page_num)
+    
+    @cached_property
+    def _page_stages(self) -> List[Callable[[PageResult, Any, int], PageResult]]:
+        """Per-page processing stages for the enabled processors, built once"""
+        stages = []
+        if self.layout_processor:
+            stages.append(self._detect_page_layout)
+        if self.table_processor:
+            stages.append(self._extract_page_tables)
+        if self.image_processor:
+            stages.append(self._extract_page_images)
+        return stages
+    
+    def _detect_page_layout(self, page_result: PageResult, page_data, page_num: int) -> PageResult:
+        """Layout detection stage"""
+        return self.layout_processor.process(page_result, page_data)
+    
+    def _extract_page_tables(self, page_result: PageResult, page_data, page_num: int) -> PageResult:
+        """Table detection and extraction stage"""
+        page_result.tables = self.table_processor.extract_tables(page_data, page_num)
+        return page_result
+    
+    def _extract_page_images(self, page_result: PageResult, page_data, page_num: int) -> PageResult:
+        """Image processing stage"""
+        page_result.images = self.image_processor.extract_images(page_data, page_num)
+        return page_result
     
     def _process_single_page(self, page_data, page_num: int) -> PageResult:
         """Process a single page"""
@@ -217,24 +416,11 @@ class SmartExtractor:
             text_blocks = self._extract_text_blocks(page_data)
             page_result.text_blocks = text_blocks
             
-            # 2. Layout detection
-            if self.layout_processor:
-                page_result = self.layout_processor.process(page_result, page_data)
-            
-            # 3. Table detection and extraction
-            if self.table_processor:
-                tables = self.table_processor.extract_tables(page_data, page_num)
-                page_result.tables = tables
+            # 2-4. Layout detection, table extraction and image processing, as enabled
+            for stage in self._page_stages:
+                page_result = stage(page_result, page_data, page_num)
             
-            # 4. Image processing
-            if self.image_processor:
-                images = self.image_processor.extract_images(page_data, page_num)
-                page_result.images = images
-            
-            # 5. OCR processing (if needed)
-            if self.ocr_processor and self._needs_ocr(page_data):
-                ocr_blocks = self.ocr_processor.process_page(page_data, page_num)
-                page_result.text_blocks.extend(ocr_blocks)
+            # OCR is applied afterwards in the calling process, see _process_pages_ocr
             
         except Exception as e:
             logger.error(f"Error processing page {page_num}: {e}")
@@ -244,12 +430,10 @@ class SmartExtractor:
     
     def _extract_text_blocks(self, page_data) -> List[TextBlock]:
         """Extract text blocks"""
-        text_blocks = []
-        
         try:
             # Extract text from PDF
-            for text_obj in page_data.text_objects:
-                block = TextBlock(
+            return [
+                TextBlock(
                     text=text_obj.text,
                     bbox=text_obj.bbox,
                     font_size=text_obj.font_size,
@@ -257,12 +441,11 @@ class SmartExtractor:
                     is_bold=text_obj.is_bold,
                     is_italic=text_obj.is_italic
                 )
-                text_blocks.append(block)
-                
+                for text_obj in page_data.text_objects
+            ]
         except Exception as e:
             logger.warning(f"Error extracting text blocks: {e}")
-        
-        return text_blocks
+            return []
     
     def _needs_ocr(self, page_data) -> bool:
         """Determine if OCR is needed"""
@@ -270,54 +453,84 @@ class SmartExtractor:
         if not page_data.text_objects:
             return True
         
-        # Check text coverage
-        total_text_length = sum(len(obj.text) for obj in page_data.text_objects)
-        if total_text_length < 50:  # Too little text, OCR may be needed
-            return True
+        # Check text coverage, stopping as soon as there is enough text
+        total_text_length = 0
+        for obj in page_data.text_objects:
+            total_text_length += len(obj.text)
+            if total_text_length >= 50:
+                return False
         
-        return False
+        # Too little text, OCR may be needed
+        return True
     
-    def _merge_results(self, pages: List[PageResult], metadata: Dict[str, Any]) -> ExtractionResult:
-        """Merge results from all pages"""
+    def _merge_results(self, page_results: Iterable[PageResult], metadata: Dict[str, Any],
+                       output_stream: Optional[TextIO] = None) -> ExtractionResult:
+        """
+        Merge results from all pages, consuming them in a single pass
+        
+        If output_stream is given, the text is written to it as pages arrive
+        and only a summary result without text and pages is returned.
+        """
         # Merge text from all text_blocks, not page.text
-        all_text = []
+        merged = output_stream if output_stream is not None else io.StringIO()
+        pages = []
+        all_tables = []
+        all_images = []
+        text_length = 0
 
-        for i, page in enumerate(pages):
-            # Check if this page has been processed for multi-column layout
-            # If so, we need to preserve the column grouping
-            if hasattr(page, '_column_processed') and page._column_processed:
-                # Page has been processed for multi-column layout
-                # The text blocks are already in correct reading order (left column first, then right column)
-                # So we can directly merge them in order
-                page_text_blocks = []
-                for j, block in enumerate(page.text_blocks):
-                    if block.text:
-                        page_text_blocks.append(block.text)
-                    else:
-                        logger.warning(f"  Block {j+1}: empty text")
+        def iter_text() -> Iterator[str]:
+            separator = ""
+            for page in page_results:
+                if output_stream is None:
+                    pages.append(page)
+                # Check if this page has been processed for multi-column layout
+                # If so, we need to preserve the column grouping
+                if hasattr(page, '_column_processed') and page._column_processed:
+                    # Page has been processed for multi-column layout
+                    # The text blocks are already in correct reading order (left column first, then right column)
+                    # So we can directly merge them in order
+                    page_text_blocks = []
+                    for j, block in enumerate(page.text_blocks):
+                        if block.text:
+                            page_text_blocks.append(block.text)
+                        else:
+                            logger.debug("  Block {}: empty text", j + 1)
+                    
+                    # Join all text blocks from this page
+                    yield separator
+                    yield "\n".join(page_text_blocks)
+                    separator = "\n\n"  # Use double newline to separate pages
+                else:
+                    # Single column or unprocessed page, merge normally
+                    for j, block in enumerate(page.text_blocks):
+                        if block.text:
+                            yield separator
+                            yield block.text
+                            separator = "\n\n"
+                        else:
+                            logger.debug("  Block {}: empty text", j + 1)
                 
-                # Join all text blocks from this page
-                page_text = "\n".join(page_text_blocks)
-                all_text.append(page_text)
-            else:
-                # Single column or unprocessed page, merge normally
-                for j, block in enumerate(page.text_blocks):
-                    if block.text:
-                        all_text.append(block.text)
-                    else:
-                        logger.warning(f"  Block {j+1}: empty text")
-        
-        merged_text = "\n\n".join(all_text)  # Use double newline to separate pages
+                # Merge tables and images
+                all_tables.extend(page.tables)
+                all_images.extend(page.images)
 
-        # Merge tables
-        all_tables = []
-        for page in pages:
-            all_tables.extend(page.tables)
+        pieces = iter_text()
+        if output_stream is not None and self.text_processor:
+            # Streamed text skips post_process, so clean it here exactly as _clean_text would clean the merged text
+            pieces = self.text_processor.iter_clean_text(pieces)
+        for piece in pieces:
+            merged.write(piece)
+            text_length += len(piece)
         
-        # Merge images
-        all_images = []
-        for page in pages:
-            all_images.extend(page.images)
+        if output_stream is not None:
+            return ExtractionResult(
+                text="",
+                tables=all_tables,
+                images=all_images,
+                metadata={**metadata, "text_length": text_length}
+            )
+        
+        merged_text = merged.getvalue()
         
         return ExtractionResult(
             text=merged_text,
@@ -333,6 +546,12 @@ class SmartExtractor:
             return self.ocr_processor.get_supported_languages()
         return []
     
+    @staticmethod
+    def static_supported_languages(engine: str = "auto") -> List[str]:
+        """Get supported languages for an OCR engine without initializing any processor"""
+        from .processors.ocr_processor import OCRProcessor
+        return OCRProcessor.list_languages(engine)
+    
     def get_processing_stats(self) -> Dict[str, Any]:
         """Get processing statistics"""
         return {
@@ -343,4 +562,19 @@ class SmartExtractor:
             "text_cleaning_enabled": self.config.enable_text_cleaning,
             "max_workers": self.config.max_workers,
             "supported_languages": self.get_supported_languages()
-        } 
\ No newline at end of file
+        }
+
+
+# Extractor used by _process_page_worker, created once per worker by _init_page_worker
+_worker_extractor: Optional[SmartExtractor] = None
+
+
+def _init_page_worker(config: ExtractionConfig):
+    """Build the extractor used by this worker process"""
+    global _worker_extractor
+    _worker_extractor = SmartExtractor(config)
+
+
+def _process_page_worker(page_data, page_num: int) -> PageResult:
+    """Process a single page in a pool worker"""
+    return _worker_extractor._process_page_safe(page_data, page_num)
@@ -2,13 +2,34 @@
 Data Models - Define data structures for extraction results
 """
 
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Union
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import MISSING, dataclass, field
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime
+from itertools import chain
+from operator import attrgetter
 import json
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
 
-@dataclass
+# dataclass(slots=True) is only available on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# pandas is optional and slow to import, so it is loaded on first use (see _import_pandas)
+_pandas = None
+
+# Serialized fields of text blocks and table cells, fetched in one C-level call per item
+_BLOCK_KEYS = ("text", "bbox", "confidence", "font_size", "font_family", "is_bold", "is_italic", "block_type")
+_CELL_KEYS = ("text", "row", "col", "bbox", "confidence", "is_header")
+_get_block_fields = attrgetter(*_BLOCK_KEYS)
+_get_cell_fields = attrgetter(*_CELL_KEYS)
+
+
+@dataclass(**_SLOTS)
 class TextBlock:
     """Text block"""
     
@@ -20,9 +41,16 @@ class TextBlock:
     is_bold: bool = False
     is_italic: bool = False
     block_type: str = "text"  # "text", "title", "header", "footer"
+    column_id: Optional[int] = None  # Set by layout detection
+    
+    def __post_init__(self):
+        """Intern the short, highly repeated category strings"""
+        self.block_type = sys.intern(self.block_type)
+        if self.font_family is not None:
+            self.font_family = sys.intern(self.font_family)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TableCell:
     """Table cell"""
     
@@ -34,9 +62,13 @@ class TableCell:
     is_header: bool = False
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TableResult:
-    """Table extraction result"""
+    """Table extraction result
+    
+    to_dict(compact=True) emits cells as {"schema": [field names], "data": [[values], ...]},
+    one value row per cell in schema order, instead of one dict per cell
+    """
     
     cells: List[TableCell]
     rows: int
@@ -47,43 +79,40 @@ class TableResult:
     
     def to_dataframe(self):
         """Convert to pandas DataFrame"""
-        try:
-            import pandas as pd
-            
-            # Create 2D array
-            data = [['' for _ in range(self.cols)] for _ in range(self.rows)]
-            
-            for cell in self.cells:
-                if 0 <= cell.row < self.rows and 0 <= cell.col < self.cols:
-                    data[cell.row][cell.col] = cell.text
-            
-            return pd.DataFrame(data)
-        except ImportError:
-            raise ImportError("pandas not installed, cannot convert to DataFrame")
+        import numpy as np
+        pd = _import_pandas()
+        
+        # Create 2D array
+        data = np.full((self.rows, self.cols), '', dtype=object)
+        
+        # Scatter all in-range cells in one assignment
+        n = len(self.cells)
+        rows = np.fromiter((cell.row for cell in self.cells), dtype=np.intp, count=n)
+        cols = np.fromiter((cell.col for cell in self.cells), dtype=np.intp, count=n)
+        texts = np.empty(n, dtype=object)
+        texts[:] = [cell.text for cell in self.cells]
+        valid = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        data[rows[valid], cols[valid]] = texts[valid]
+        
+        return pd.DataFrame(data, copy=False)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, compact: bool = False) -> Dict[str, Any]:
         """Convert to dictionary format"""
+        if compact:
+            cells = {"schema": list(_CELL_KEYS), "data": list(map(_get_cell_fields, self.cells))}
+        else:
+            cells = [dict(zip(_CELL_KEYS, _get_cell_fields(cell))) for cell in self.cells]
         return {
             "rows": self.rows,
             "cols": self.cols,
             "bbox": self.bbox,
             "confidence": self.confidence,
             "page_number": self.page_number,
-            "cells": [
-                {
-                    "text": cell.text,
-                    "row": cell.row,
-                    "col": cell.col,
-                    "bbox": cell.bbox,
-                    "confidence": cell.confidence,
-                    "is_header": cell.is_header
-                }
-                for cell in self.cells
-            ]
+            "cells": cells
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ImageResult:
     """Image extraction result"""
     
@@ -94,6 +123,10 @@ class ImageResult:
     extracted_text: Optional[str] = None
     confidence: float = 1.0
     
+    def __post_init__(self):
+        """Intern the image type, shared by every image of the same kind"""
+        self.image_type = sys.intern(self.image_type)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format"""
         return {
@@ -106,7 +139,7 @@ class ImageResult:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PageResult:
     """Single page extraction result"""
     
@@ -116,65 +149,106 @@ class PageResult:
     images: List[ImageResult] = field(default_factory=list)
     width: float = 0.0
     height: float = 0.0
+    _column_processed: bool = field(default=False, init=False, repr=False, compare=False)  # Set by layout detection
+    # (text_blocks list, (its length, width, height), column count), set by layout detection
+    _column_count: Optional[Tuple[List[TextBlock], Tuple[int, float, float], int]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # (text_blocks list, its length, bboxes, valid), rebuilt when text_blocks changes
+    _bbox_cache: Optional[Tuple[List[TextBlock], int, Any, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     @property
     def text(self) -> str:
         """Get page text"""
         return "\n".join(block.text for block in self.text_blocks)
     
+    def bbox_array(self) -> Tuple[Any, Any]:
+        """Get text block bboxes as an (N, 4) array and a mask of blocks that have one
+        
+        The arrays are cached and shared between callers, so they are read-only
+        """
+        cache = self._bbox_cache
+        if cache is None or cache[0] is not self.text_blocks or cache[1] != len(self.text_blocks):
+            bboxes, valid = _bbox_array(self.text_blocks)
+            bboxes.flags.writeable = False
+            valid.flags.writeable = False
+            cache = self._bbox_cache = (self.text_blocks, len(self.text_blocks), bboxes, valid)
+        return cache[2], cache[3]
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format"""
         return {
             "page_number": self.page_number,
             "width": self.width,
             "height": self.height,
-            "text_blocks": [
-                {
-                    "text": block.text,
-                    "bbox": block.bbox,
-                    "confidence": block.confidence,
-                    "font_size": block.font_size,
-                    "font_family": block.font_family,
-                    "is_bold": block.is_bold,
-                    "is_italic": block.is_italic,
-                    "block_type": block.block_type
-                }
-                for block in self.text_blocks
-            ],
+            "text_blocks": [dict(zip(_BLOCK_KEYS, _get_block_fields(block))) for block in self.text_blocks],
             "tables": [table.to_dict() for table in self.tables],
             "images": [image.to_dict() for image in self.images]
         }
 
 
+class _Unset:
+    """Marks an ExtractionResult aggregate that was not provided and has not been built yet"""
+    
+    def __repr__(self):
+        return "<unset>"
+    
+    def __reduce__(self):
+        # Pickle by reference so the marker keeps its identity in other processes
+        return "_UNSET"
+
+
+_UNSET = _Unset()
+
+
+class _PageAggregate:
+    """ExtractionResult field that, when not provided at construction, is built from the pages on first read"""
+    
+    def __init__(self, build: Callable[[List[PageResult]], Any], default: Any = MISSING):
+        self.build = build
+        self.default = default  # MISSING keeps the dataclass field required
+    
+    def __set_name__(self, owner, name):
+        self.name = "_" + name
+    
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self.default
+        value = obj.__dict__[self.name]
+        if value is _UNSET:
+            value = obj.__dict__[self.name] = self.build(obj.pages)
+        return value
+    
+    def __set__(self, obj, value):
+        # Only __init__ sets the field before it exists: an omitted or empty value there means
+        # "not provided", so aggregate from pages when first read. Later assignments are kept as given
+        if self.name not in obj.__dict__ and (value is _UNSET or not value):
+            value = _UNSET
+        obj.__dict__[self.name] = value
+
+
 @dataclass
 class ExtractionResult:
     """Complete extraction result"""
     
-    text: str
+    # Not slotted: text/tables/images are lazy descriptors, and there is one instance per document
+    text: str = _PageAggregate(lambda pages: "\n\n".join(page.text for page in pages))
     pages: List[PageResult] = field(default_factory=list)
-    tables: List[TableResult] = field(default_factory=list)
-    images: List[ImageResult] = field(default_factory=list)
+    tables: List[TableResult] = _PageAggregate(
+        lambda pages: list(chain.from_iterable(page.tables for page in pages)), default=_UNSET
+    )
+    images: List[ImageResult] = _PageAggregate(
+        lambda pages: list(chain.from_iterable(page.images for page in pages)), default=_UNSET
+    )
     metadata: Dict[str, Any] = field(default_factory=dict)
     processing_time: float = 0.0
     extraction_date: datetime = field(default_factory=datetime.now)
-    
-    def __post_init__(self):
-        """Post-initialization processing"""
-        # If text is not provided, extract from pages
-        if not self.text and self.pages:
-            self.text = "\n\n".join(page.text for page in self.pages)
-        
-        # If tables are not provided, extract from pages
-        if not self.tables and self.pages:
-            self.tables = []
-            for page in self.pages:
-                self.tables.extend(page.tables)
-        
-        # If images are not provided, extract from pages
-        if not self.images and self.pages:
-            self.images = []
-            for page in self.pages:
-                self.images.extend(page.images)
+    # (pages list, its length, page_number -> page), rebuilt when pages change
+    _page_index: Optional[Tuple[List[PageResult], int, Dict[int, PageResult]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format"""
@@ -190,12 +264,55 @@ class ExtractionResult:
     
     def to_json(self, indent: int = 2) -> str:
         """Convert to JSON format"""
-        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+        return self.to_json_bytes(indent).decode('utf-8')
+    
+    def to_json_bytes(self, indent: int = 2) -> bytes:
+        """Convert to UTF-8 encoded JSON"""
+        return _dumps_json(self.to_dict(), indent)
     
     def save_json(self, file_path: str, indent: int = 2):
         """Save as JSON file"""
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.to_dict(), f, indent=indent, ensure_ascii=False)
+        with open(file_path, 'wb') as f:
+            self._stream_json(f, indent)
+    
+    def _stream_json(self, fp: BinaryIO, indent: Optional[int] = 2):
+        """Write the same document as to_json, serializing one page/table/image at a time
+        
+        Only a single item's dict is alive at any point, instead of the whole nested tree
+        """
+        pad = b" " * (indent or 0)
+        newline = b"\n" if indent is not None else b""
+        colon = b": " if indent is not None else b":"
+        
+        def dump(value: Any, depth: int) -> bytes:
+            # Nested values are serialized standalone, so shift their lines to this depth
+            data = _dumps_json(value, indent)
+            return data.replace(b"\n", b"\n" + pad * depth) if indent else data
+        
+        fields = [
+            ("text", self.text),
+            ("pages", self.pages),
+            ("tables", self.tables),
+            ("images", self.images),
+            ("metadata", self.metadata),
+            ("processing_time", self.processing_time),
+            ("extraction_date", self.extraction_date.isoformat()),
+        ]
+        fp.write(b"{")
+        for i, (key, value) in enumerate(fields):
+            if i:
+                fp.write(b",")
+            fp.write(newline + pad + _dumps_json(key) + colon)
+            if key not in ("pages", "tables", "images") or not value:
+                fp.write(dump(value, 1))
+                continue
+            fp.write(b"[")
+            for j, item in enumerate(value):
+                if j:
+                    fp.write(b",")
+                fp.write(newline + pad * 2 + dump(item.to_dict(), 2))
+            fp.write(newline + pad + b"]")
+        fp.write(newline + b"}")
     
     def save_text(self, file_path: str):
         """Save as text file"""
@@ -204,27 +321,80 @@ class ExtractionResult:
     
     def get_table_dataframes(self):
         """Get list of DataFrames for all tables"""
-        return [table.to_dataframe() for table in self.tables]
+        if len(self.tables) < 4:
+            # Not worth the thread pool setup for a handful of tables
+            return [table.to_dataframe() for table in self.tables]
+        _import_pandas()  # Fail fast, and import once rather than racing in every worker
+        with ThreadPoolExecutor(max_workers=min(8, len(self.tables))) as executor:
+            return list(executor.map(TableResult.to_dataframe, self.tables))
     
     def get_text_by_type(self, block_type: str) -> str:
         """Get text by block type"""
-        texts = []
-        for page in self.pages:
-            for block in page.text_blocks:
-                if block.block_type == block_type:
-                    texts.append(block.text)
-        return "\n".join(texts)
+        block_type = sys.intern(block_type)  # Block types are interned, so == matches on identity
+        return "\n".join([
+            block.text
+            for page in self.pages
+            for block in page.text_blocks
+            if block.block_type == block_type
+        ])
     
     def get_tables_by_page(self, page_number: int) -> List[TableResult]:
         """Get tables from specified page"""
-        for page in self.pages:
-            if page.page_number == page_number:
-                return page.tables
-        return []
+        page = self._get_page(page_number)
+        return page.tables if page is not None else []
     
     def get_images_by_page(self, page_number: int) -> List[ImageResult]:
         """Get images from specified page"""
-        for page in self.pages:
-            if page.page_number == page_number:
-                return page.images
-        return [] 
\ No newline at end of file
+        page = self._get_page(page_number)
+        return page.images if page is not None else []
+    
+    def _get_page(self, page_number: int) -> Optional[PageResult]:
+        """Look up a page by number through an index built on first use"""
+        index = self._page_index
+        if index is None or index[0] is not self.pages or index[1] != len(self.pages):
+            pages = {}
+            for page in self.pages:
+                pages.setdefault(page.page_number, page)  # First page wins, as in a linear scan
+            index = self._page_index = (self.pages, len(self.pages), pages)
+        return index[2].get(page_number)
+
+
+def _import_pandas():
+    """Import pandas on first use and keep the module for later calls"""
+    global _pandas
+    if _pandas is None:
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError("pandas not installed, cannot convert to DataFrame")
+        _pandas = pandas
+    return _pandas
+
+
+def _bbox_array(blocks: List[TextBlock]) -> Tuple[Any, Any]:
+    """Stack block bboxes into an (N, 4) array; rows without a usable bbox are NaN and masked out"""
+    import numpy as np
+    
+    bboxes = np.full((len(blocks), 4), np.nan)
+    valid = np.zeros(len(blocks), dtype=bool)
+    for i, block in enumerate(blocks):
+        if block.bbox and len(block.bbox) >= 4:
+            bboxes[i] = block.bbox[:4]
+            valid[i] = True
+    return bboxes, valid
+
+
+def _dumps_json(data: Any, indent: Optional[int] = 2) -> bytes:
+    """Serialize to UTF-8 JSON, using orjson when available (it only supports an indent of 2)"""
+    if orjson is not None and indent in (None, 2):
+        # Match json.dumps: non-str keys (e.g. int metadata keys) are stringified
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(data, option=option | orjson.OPT_INDENT_2 if indent else option)
+    return json.dumps(data, indent=indent, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars/arrays in the json fallback, as orjson does with OPT_SERIALIZE_NUMPY"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -2,12 +2,18 @@
 Processor module - Contains various PDF processing components
 """
 
-from .pdf_processor import PDFProcessor
-from .ocr_processor import OCRProcessor
-from .layout_processor import LayoutProcessor
-from .table_processor import TableProcessor
-from .image_processor import ImageProcessor
-from .text_processor import TextProcessor
+import importlib
+
+# Processors are imported on first access so that importing one of them
+# does not pull in the dependencies of all the others
+_PROCESSOR_MODULES = {
+    "PDFProcessor": ".pdf_processor",
+    "OCRProcessor": ".ocr_processor",
+    "LayoutProcessor": ".layout_processor",
+    "TableProcessor": ".table_processor",
+    "ImageProcessor": ".image_processor",
+    "TextProcessor": ".text_processor",
+}
 
 __all__ = [
     "PDFProcessor",
@@ -16,4 +22,10 @@ __all__ = [
     "TableProcessor",
     "ImageProcessor",
     "TextProcessor",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _PROCESSOR_MODULES:
+        return getattr(importlib.import_module(_PROCESSOR_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -19,37 +19,21 @@ class ImageProcessor:
     def extract_images(self, page_data, page_num: int) -> List[ImageResult]:
         """提取图像"""
         try:
-            logger.info(f"图像提取第 {page_num} 页")
+            logger.debug(f"图像提取第 {page_num} 页")
             
-            images = []
-            
-            # 处理从PDF中提取的图像数据
-            for image_data in page_data.images:
-                image_result = self._process_image_data(image_data, page_num)
-                if image_result:
-                    images.append(image_result)
+            # 处理从PDF中提取的图像数据（整页共用一个 try，不再逐图建立异常处理）
+            images = [
+                ImageResult(
+                    image_path="",  # 暂时为空
+                    bbox=image_data.get('bbox', [0, 0, 0, 0]),
+                    page_number=page_num,
+                    image_type=image_data.get('type', 'image')
+                )
+                for image_data in page_data.images
+            ]
             
             return images
             
         except Exception as e:
             logger.error(f"图像提取失败: {e}")
             raise ImageProcessingError(f"图像提取失败: {e}")
-    
-    def _process_image_data(self, image_data: dict, page_num: int) -> ImageResult:
-        """处理图像数据"""
-        try:
-            bbox = image_data.get('bbox', [0, 0, 0, 0])
-            width = image_data.get('width', 0)
-            height = image_data.get('height', 0)
-            image_type = image_data.get('type', 'image')
-            
-            return ImageResult(
-                image_path="",  # 暂时为空
-                bbox=bbox,
-                page_number=page_num,
-                image_type=image_type
-            )
-            
-        except Exception as e:
-            logger.warning(f"处理图像数据失败: {e}")
-            return None 
\ No newline at end of file
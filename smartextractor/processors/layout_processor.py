@@ -2,13 +2,60 @@
 Layout Processor - Responsible for detecting document layout structure
 """
 
-from typing import List, Tuple, Dict
+import re
+from typing import List, Sequence
+
+import numpy as np
 from loguru import logger
 
 from ..config import ExtractionConfig
-from ..models import PageResult, TextBlock
+from ..clustering import two_means_1d
+from ..models import PageResult, TextBlock, _bbox_array
 from ..exceptions import LayoutDetectionError
 
+# Typical header patterns
+_HEADER_PATTERNS = [
+    # Page numbers
+    r'^\d+$',
+    # Document titles (short, centered)
+    r'^[A-Z][A-Z\s]{1,50}$',
+    # Chapter/section headers
+    r'^(Chapter|Section|Part)\s+\d+',
+    # Date patterns
+    r'^\d{1,2}[/-]\d{1,2}[/-]\d{2,4}$',
+    r'^\d{4}-\d{2}-\d{2}$',
+    # Company/organization names (short)
+    r'^[A-Z][A-Z\s&]{1,30}$',
+    # Simple header text (for testing)
+    r'^Header$'
+]
+
+# Typical footer patterns
+_FOOTER_PATTERNS = [
+    # Page numbers
+    r'^\d+$',
+    # Page indicators
+    r'^Page\s+\d+',
+    r'^-\s*\d+\s*-$',
+    # Date patterns
+    r'^\d{1,2}[/-]\d{1,2}[/-]\d{2,4}$',
+    r'^\d{4}-\d{2}-\d{2}$',
+    # Copyright notices
+    r'^©\s*\d{4}',
+    r'^Copyright\s+\d{4}',
+    # Confidential markings
+    r'^(Confidential|Internal|Draft)',
+    # File paths or document names
+    r'^[A-Z]:\\',
+    r'^/[a-zA-Z/]+$',
+    # Simple footer text (for testing)
+    r'^Footer$'
+]
+
+# Each role's patterns fused into one alternation, so a block costs a single match call
+_HEADER_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in _HEADER_PATTERNS))
+_FOOTER_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in _FOOTER_PATTERNS))
+
 
 class LayoutProcessor:
     """Layout Processor"""
@@ -19,20 +66,19 @@ class LayoutProcessor:
     def process(self, page_result: PageResult, page_data) -> PageResult:
         """Process page layout"""
         try:
-            logger.info(f"Layout detection for page {page_result.page_number}")
-            
-            # Detect titles
-            if self.config.detect_headers:
-                page_result = self._detect_headers(page_result)
+            logger.debug(f"Layout detection for page {page_result.page_number}")
             
-            # Detect headers and footers
+            # Detect titles, headers and footers
             if self.config.detect_headers:
-                page_result = self._detect_headers_footers(page_result)
+                page_result = self._detect_headers_footers(page_result, detect_titles=True)
             
             # Detect multi-column layout
             if self.config.detect_columns:
                 page_result = self._detect_columns(page_result)
             
+            # The detectors shared one bbox matrix; don't ship it back from page workers
+            page_result._bbox_cache = None
+            
             return page_result
             
         except Exception as e:
@@ -48,8 +94,8 @@ class LayoutProcessor:
         
         return page_result
     
-    def _detect_headers_footers(self, page_result: PageResult) -> PageResult:
-        """Detect headers and footers with improved accuracy"""
+    def _detect_headers_footers(self, page_result: PageResult, detect_titles: bool = False) -> PageResult:
+        """Detect headers and footers with improved accuracy, and titles in the same pass if requested"""
         page_height = page_result.height
         page_width = page_result.width
         
@@ -57,34 +103,30 @@ class LayoutProcessor:
         header_threshold = page_height * 0.05
         footer_threshold = page_height * 0.95
         
-        for block in page_result.text_blocks:
-            if not block.bbox or len(block.bbox) < 4:
-                continue
-                
-            y_top = block.bbox[1]
-            y_bottom = block.bbox[3]
-            x_left = block.bbox[0]
-            x_right = block.bbox[2]
-            
-            # Calculate text block dimensions
-            block_height = y_bottom - y_top
-            block_width = x_right - x_left
-            
-            # Skip very large text blocks (likely main content)
-            if block_height > page_height * 0.3 or block_width > page_width * 0.8:
-                continue
-            
-            # Header detection: text block must be mostly in top 5% area
-            if y_top < header_threshold and y_bottom < header_threshold * 2:
-                # Additional content-based checks for headers
-                if self._is_likely_header(block, page_width):
-                    block.block_type = "header"
-            
-            # Footer detection: text block must be mostly in bottom 5% area
-            elif y_bottom > footer_threshold and y_top > footer_threshold - header_threshold:
-                # Additional content-based checks for footers
-                if self._is_likely_footer(block, page_width):
-                    block.block_type = "footer"
+        bboxes, valid = page_result.bbox_array()
+        x_left, y_top, x_right, y_bottom = bboxes.T
+        
+        # Skip blocks without a bbox and very large text blocks (likely main content)
+        candidates = valid & ~((y_bottom - y_top > page_height * 0.3) | (x_right - x_left > page_width * 0.8))
+        
+        # Header detection: text block must be mostly in top 5% area
+        in_header = candidates & (y_top < header_threshold) & (y_bottom < header_threshold * 2)
+        # Footer detection: text block must be mostly in bottom 5% area
+        in_footer = (candidates & ~in_header
+                     & (y_bottom > footer_threshold) & (y_top > footer_threshold - header_threshold))
+        
+        # Only blocks in those bands get the content-based checks
+        blocks = page_result.text_blocks
+        headers = [i for i in np.flatnonzero(in_header).tolist() if self._is_likely_header(blocks[i], page_width)]
+        footers = [i for i in np.flatnonzero(in_footer).tolist() if self._is_likely_footer(blocks[i], page_width)]
+        
+        # Titles by font size; header/footer classification takes precedence
+        if detect_titles:
+            self._detect_headers(page_result)
+        for i in headers:
+            blocks[i].block_type = "header"
+        for i in footers:
+            blocks[i].block_type = "footer"
         
         return page_result
     
@@ -104,26 +146,8 @@ class LayoutProcessor:
             return False
         
         # Check for typical header patterns
-        header_patterns = [
-            # Page numbers
-            r'^\d+$',
-            # Document titles (short, centered)
-            r'^[A-Z][A-Z\s]{1,50}$',
-            # Chapter/section headers
-            r'^(Chapter|Section|Part)\s+\d+',
-            # Date patterns
-            r'^\d{1,2}[/-]\d{1,2}[/-]\d{2,4}$',
-            r'^\d{4}-\d{2}-\d{2}$',
-            # Company/organization names (short)
-            r'^[A-Z][A-Z\s&]{1,30}$',
-            # Simple header text (for testing)
-            r'^Header$'
-        ]
-        
-        import re
-        for pattern in header_patterns:
-            if re.match(pattern, text):
-                return True
+        if _HEADER_RE.match(text):
+            return True
         
         # Check if text is centered (typical for headers)
         if block.bbox and len(block.bbox) >= 4:
@@ -155,31 +179,8 @@ class LayoutProcessor:
             return False
         
         # Check for typical footer patterns
-        footer_patterns = [
-            # Page numbers
-            r'^\d+$',
-            # Page indicators
-            r'^Page\s+\d+',
-            r'^-\s*\d+\s*-$',
-            # Date patterns
-            r'^\d{1,2}[/-]\d{1,2}[/-]\d{2,4}$',
-            r'^\d{4}-\d{2}-\d{2}$',
-            # Copyright notices
-            r'^©\s*\d{4}',
-            r'^Copyright\s+\d{4}',
-            # Confidential markings
-            r'^(Confidential|Internal|Draft)',
-            # File paths or document names
-            r'^[A-Z]:\\',
-            r'^/[a-zA-Z/]+$',
-            # Simple footer text (for testing)
-            r'^Footer$'
-        ]
-        
-        import re
-        for pattern in footer_patterns:
-            if re.match(pattern, text):
-                return True
+        if _FOOTER_RE.match(text):
+            return True
         
         # Check if text is centered (typical for footers)
         if block.bbox and len(block.bbox) >= 4:
@@ -202,7 +203,7 @@ class LayoutProcessor:
         try:
             # 1. Use improved algorithm to analyze text block distribution and detect multi-column layout
             column_count = self._improve_column_detection(page_result)
-            print(f"column_count: {column_count}")
+            logger.debug("Page {} column count: {}", page_result.page_number, column_count)
             if column_count <= 1:
                 # Single column layout, no need to reorder
                 return page_result
@@ -212,8 +213,11 @@ class LayoutProcessor:
             sorted_columns = self._sort_blocks_in_columns(columns)
             # 4. Reorder text blocks in reading order
             reordered_blocks = self._merge_columns_in_reading_order(sorted_columns, page_result.width)
-            # 5. Update page result
+            # 5. Update page result (same blocks in a new order, so the column count still holds)
             page_result.text_blocks = reordered_blocks
+            page_result._column_count = (
+                reordered_blocks, (len(reordered_blocks), page_result.width, page_result.height), column_count
+            )
             # 6. Mark page as processed for multi-column layout
             page_result._column_processed = True
             return page_result
@@ -227,12 +231,10 @@ class LayoutProcessor:
             return 1
         
         # Collect all x coordinates of text blocks
-        x_positions = []
-        for block in page_result.text_blocks:
-            if block.bbox and len(block.bbox) >= 2:
-                x_positions.append(block.bbox[0])  # x1 coordinate
+        bboxes, valid = page_result.bbox_array()
+        x_positions = bboxes[valid, 0]  # x1 coordinate
         
-        if not x_positions:
+        if not len(x_positions):
             return 1
         
         # Calculate page width
@@ -245,34 +247,26 @@ class LayoutProcessor:
         
         return column_count
     
-    def _detect_columns_by_clustering(self, x_positions: List[float], page_width: float) -> int:
+    def _detect_columns_by_clustering(self, x_positions: Sequence[float], page_width: float) -> int:
         """Detect number of columns using clustering method (优化版)"""
-        if not x_positions:
+        if not len(x_positions):
             return 1
-        unique_x = sorted(set(x_positions))
+        unique_x = np.unique(np.asarray(x_positions, dtype=float))
         if len(unique_x) < 2:
             return 1
-        import numpy as np
         hist, bin_edges = np.histogram(unique_x, bins=min(20, len(unique_x)//2+1), range=(0, page_width))
-        avg = np.mean(hist)
-        gap_bins = [i for i, h in enumerate(hist) if h < avg*0.4]
-        if len(gap_bins) > 0:
-            for i in gap_bins:
-                left = bin_edges[i]
-                right = bin_edges[i+1]
-                if left > page_width*0.25 and right < page_width*0.75:
-                    return 2
-        gaps = []
-        for i in range(1, len(unique_x)):
-            gap = unique_x[i] - unique_x[i-1]
-            if gap > 20:
-                gaps.append(gap)
-        if not gaps:
+        # A sparse bin in the middle half of the page is a column gutter
+        gap_bins = hist < hist.mean()*0.4
+        if np.any(gap_bins & (bin_edges[:-1] > page_width*0.25) & (bin_edges[1:] < page_width*0.75)):
+            return 2
+        gaps = np.diff(unique_x)
+        gaps = gaps[gaps > 20]
+        if not len(gaps):
             return 1
-        avg_gap = sum(gaps) / len(gaps)
-        large_gaps = [gap for gap in gaps if gap > avg_gap * 1.1 or gap > page_width * 0.2]
-        if large_gaps:
-            estimated_columns = self._estimate_column_count(page_width, large_gaps)
+        avg_gap = gaps.mean()
+        large_gaps = gaps[(gaps > avg_gap * 1.1) | (gaps > page_width * 0.2)]
+        if len(large_gaps):
+            estimated_columns = self._estimate_column_count(page_width, large_gaps.tolist())
             return max(1, min(estimated_columns, 4))
         return 1
     
@@ -299,37 +293,25 @@ class LayoutProcessor:
     def _assign_blocks_to_columns(self, page_result: PageResult, column_count: int) -> List[List[TextBlock]]:
         """Assign text blocks to different columns"""
         columns = [[] for _ in range(column_count)]
-        page_width = page_result.width
+        blocks = page_result.text_blocks
+        if not blocks:
+            return columns
         
-        # Calculate width and boundaries of each column
-        column_width = page_width / column_count
-        column_boundaries = []
+        # Calculate right boundary of each column (each column starts where the previous one ends)
+        column_width = page_result.width / column_count
+        rights = np.arange(1, column_count + 1) * column_width
         
-        for i in range(column_count):
-            left = i * column_width
-            right = (i + 1) * column_width
-            column_boundaries.append((left, right))
+        # Find which column each block center is in (0 if it is off the page)
+        bboxes, valid = page_result.bbox_array()
+        centers_x = (bboxes[:, 0] + bboxes[:, 2]) / 2
+        column_ids = np.searchsorted(rights, centers_x, side='right')
+        on_page = valid & (centers_x >= 0) & (column_ids < column_count)
+        assigned = np.where(on_page, column_ids, 0)
         
-        # Assign text blocks to corresponding columns
-        for block in page_result.text_blocks:
-            if not block.bbox or len(block.bbox) < 2:
-                # Blocks without position info go to the first column
-                block.column_id = 0
-                columns[0].append(block)
-                continue
-            
-            block_center_x = (block.bbox[0] + block.bbox[2]) / 2
-            
-            # Find which column the block center is in
-            assigned_column = 0
-            for i, (left, right) in enumerate(column_boundaries):
-                if left <= block_center_x < right:
-                    assigned_column = i
-                    break
-            
-            # Assign column_id to the block
-            block.column_id = assigned_column
-            columns[assigned_column].append(block)
+        # Assign column_id to the block; blocks without position info go to the first column
+        for block, column_id in zip(blocks, assigned.tolist()):
+            block.column_id = column_id
+            columns[column_id].append(block)
         
         return columns
     
@@ -389,21 +371,14 @@ class LayoutProcessor:
                 merged_blocks.extend(column)
             return merged_blocks
         
-        # Find unique row positions
+        # Find unique row positions. Both columns are already sorted by y, so sorting their
+        # concatenation is a linear two-run merge, and rows are found in ascending order:
+        # the last row is the closest one below y, so it is the only one that can match
         unique_rows = []
         for y in sorted(all_y_coords):
-            # Check if this y-coordinate is close to any existing row
-            found = False
-            for existing_y in unique_rows:
-                if abs(y - existing_y) <= row_tolerance:
-                    found = True
-                    break
-            if not found:
+            if not unique_rows or y - unique_rows[-1] > row_tolerance:
                 unique_rows.append(y)
         
-        # Sort rows by y-coordinate
-        unique_rows.sort()
-        
         # Merge blocks row by row
         merged_blocks = []
         for row_y in unique_rows:
@@ -430,17 +405,13 @@ class LayoutProcessor:
         if not text_blocks:
             return "ltr"  # left-to-right
         
-        # Simple language detection (based on characters)
-        chinese_chars = 0
-        total_chars = 0
-        
-        for block in text_blocks:
-            if block.text:
-                for char in block.text:
-                    total_chars += 1
-                    # Detect Chinese characters
-                    if '\u4e00' <= char <= '\u9fff':
-                        chinese_chars += 1
+        # Simple language detection (based on characters): scan all code points at once
+        text = "".join(block.text for block in text_blocks if block.text)
+        # surrogatepass keeps lone surrogates from broken text layers as single code points
+        code_points = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+        total_chars = code_points.size
+        # Detect Chinese characters
+        chinese_chars = int(((code_points >= 0x4E00) & (code_points <= 0x9FFF)).sum())
         
         if total_chars > 0 and chinese_chars / total_chars > 0.3:
             return "ltr"  # Chinese, left-to-right
@@ -451,41 +422,40 @@ class LayoutProcessor:
         """Improved column count detection method"""
         if not page_result.text_blocks:
             return 1
+        # Reuse the count if this page was already analyzed and its blocks have not changed
+        key = (len(page_result.text_blocks), page_result.width, page_result.height)
+        cached = page_result._column_count
+        if cached is not None and cached[0] is page_result.text_blocks and cached[1] == key:
+            return cached[2]
         # Method 1: Clustering analysis based on text block distribution
         column_count_1 = self._analyze_column_layout(page_result)
         # Method 2: Heuristic detection based on page width
         column_count_2 = self._heuristic_column_detection(page_result)
-        # Method 3: Density-based detection
-        column_count_3 = self._density_based_column_detection(page_result)
-        # Combine results
-        column_counts = [column_count_1, column_count_2, column_count_3]
-        from collections import Counter
-        counter = Counter(column_counts)
-        most_common = counter.most_common(1)[0][0]
+        # Combine results: majority vote, falling back to the first method when all disagree.
+        # If methods 1 and 2 agree, method 3 cannot change the vote, so it is skipped
+        most_common = column_count_1
+        if column_count_1 != column_count_2:
+            # Method 3: Density-based detection
+            column_count_3 = self._density_based_column_detection(page_result)
+            if column_count_2 == column_count_3:
+                most_common = column_count_2
+        page_result._column_count = (page_result.text_blocks, key, most_common)
         return most_common
     
     def _heuristic_column_detection(self, page_result: PageResult) -> int:
         """Heuristic column count detection (优化版)"""
         if not page_result.text_blocks or page_result.width == 0:
             return 1
-        block_widths = []
-        x_centers = []
-        for block in page_result.text_blocks:
-            if block.bbox and len(block.bbox) >= 4:
-                width = block.bbox[2] - block.bbox[0]
-                block_widths.append(width)
-                x_centers.append((block.bbox[0] + block.bbox[2]) / 2)
-        if not block_widths:
+        bboxes, valid = page_result.bbox_array()
+        bboxes = bboxes[valid]
+        if not len(bboxes):
             return 1
-        avg_block_width = sum(block_widths) / len(block_widths)
+        avg_block_width = float((bboxes[:, 2] - bboxes[:, 0]).mean())
+        x_centers = (bboxes[:, 0] + bboxes[:, 2]) / 2
         page_width = page_result.width
-        import numpy as np
         if len(x_centers) > 10:
-            from sklearn.cluster import KMeans
-            X = np.array(x_centers).reshape(-1, 1)
-            kmeans = KMeans(n_clusters=2, random_state=0).fit(X)
-            centers = sorted([c[0] for c in kmeans.cluster_centers_])
-            if abs(centers[1] - centers[0]) > page_width * 0.3:
+            centers = two_means_1d(x_centers)
+            if centers and centers[1] - centers[0] > page_width * 0.3:
                 return 2
         if avg_block_width < page_width * 0.45:
             estimated_columns = int(page_width / (avg_block_width * 1.1))
@@ -502,50 +472,46 @@ class LayoutProcessor:
         cols = int(page_result.width / grid_size) + 1
         rows = int(page_result.height / grid_size) + 1
         
-        # Initialize density matrix
-        density_matrix = [[0 for _ in range(cols)] for _ in range(rows)]
-        
-        # Calculate text density for each grid
-        for block in page_result.text_blocks:
-            if not block.bbox or len(block.bbox) < 4:
-                continue
-            
-            # Calculate grids covered by block
-            x1, y1, x2, y2 = block.bbox
-            start_col = max(0, int(x1 / grid_size))
-            end_col = min(cols - 1, int(x2 / grid_size))
-            start_row = max(0, int(y1 / grid_size))
-            end_row = min(rows - 1, int(y2 / grid_size))
-            
-            # Increase density for covered grids
-            for row in range(start_row, end_row + 1):
-                for col in range(start_col, end_col + 1):
-                    density_matrix[row][col] += len(block.text) if block.text else 1
+        # Calculate grids covered by each block
+        bboxes, valid = page_result.bbox_array()
+        cells = np.trunc(bboxes[valid] / grid_size).astype(int)
+        start_col = np.maximum(cells[:, 0], 0)
+        end_col = np.minimum(cells[:, 2], cols - 1)
+        start_row = np.maximum(cells[:, 1], 0)
+        end_row = np.minimum(cells[:, 3], rows - 1)
+        weights = np.array([len(block.text) if block.text else 1
+                            for block, ok in zip(page_result.text_blocks, valid) if ok])
+        covers = (start_col <= end_col) & (start_row <= end_row)
+        start_col, end_col, start_row, end_row, weights = (
+            a[covers] for a in (start_col, end_col, start_row, end_row, weights)
+        )
+        
+        # Only per-column totals are used, so skip the 2D grid: each block adds its weight to
+        # every cell it covers, i.e. weight x rows covered to each of its columns. Mark those
+        # column ranges in a difference array and prefix-sum it
+        column_weights = weights * (end_row - start_row + 1)
+        diff = np.bincount(
+            np.concatenate([start_col, end_col + 1]),
+            weights=np.concatenate([column_weights, -column_weights]),
+            minlength=cols + 1,
+        )
+        column_densities = diff.astype(np.int64).cumsum()[:cols]
         
         # Analyze density distribution
-        column_count = self._analyze_density_distribution(density_matrix, cols)
+        column_count = self._analyze_density_distribution(column_densities)
         
         return column_count
     
-    def _analyze_density_distribution(self, density_matrix: List[List[int]], cols: int) -> int:
-        """Analyze density distribution and detect number of columns"""
-        if not density_matrix:
+    def _analyze_density_distribution(self, column_densities: np.ndarray) -> int:
+        """Analyze per-column text density and detect number of columns"""
+        if column_densities.size == 0:
             return 1
         
-        # Calculate average density for each column
-        column_densities = []
-        for col in range(cols):
-            col_density = sum(density_matrix[row][col] for row in range(len(density_matrix)))
-            column_densities.append(col_density)
-        
-        if not column_densities:
-            return 1
-        
-        avg_density = sum(column_densities) / len(column_densities)
+        avg_density = column_densities.sum() / len(column_densities)
         threshold = avg_density * 0.3
         
         # Count number of high-density columns
-        high_density_columns = sum(1 for density in column_densities if density > threshold)
+        high_density_columns = int((column_densities > threshold).sum())
         
         # Estimate number of columns based on number of high-density columns
         if high_density_columns <= 1:
@@ -562,39 +528,28 @@ class LayoutProcessor:
         if not blocks:
             return []
         
-        # Sort blocks by y-coordinate
-        sorted_blocks = sorted(blocks, key=lambda block: block.bbox[1] if block.bbox else 0)
+        # Sort blocks by y-coordinate (stable, blocks without bbox sort as y=0)
+        bboxes, valid = _bbox_array(blocks)
+        keys = np.where(valid, bboxes[:, 1], 0.0)
+        order = np.argsort(keys, kind='stable')
+        sorted_valid = valid[order]
+        ys = keys[order][sorted_valid]
         
-        # Group blocks by approximate row
+        # Each row is anchored at its first block: a block joins the row while it is
+        # within row_tolerance below the anchor, so row starts can be found by bisection
         row_tolerance = 20  # pixels
-        row_groups = []
-        current_row = []
-        current_y = None
-        
-        for block in sorted_blocks:
-            if not block.bbox or len(block.bbox) < 4:
-                # Blocks without bbox go to current row
-                current_row.append(block)
-                continue
-            
-            block_y = block.bbox[1]
-            
-            if current_y is None:
-                # First block
-                current_y = block_y
-                current_row = [block]
-            elif abs(block_y - current_y) <= row_tolerance:
-                # Same row
-                current_row.append(block)
-            else:
-                # New row
-                if current_row:
-                    row_groups.append(current_row)
-                current_y = block_y
-                current_row = [block]
-        
-        # Add the last row
-        if current_row:
-            row_groups.append(current_row)
-        
-        return row_groups 
\ No newline at end of file
+        row_starts = []
+        i = 0
+        while i < len(ys):
+            row_starts.append(i)
+            i = int(np.searchsorted(ys, ys[i] + row_tolerance, side='right'))
+        
+        # Blocks without bbox go to the row in progress (the first row if none has started)
+        row_ids = np.full(len(blocks), -1)
+        row_ids[sorted_valid] = np.searchsorted(row_starts, np.arange(len(ys)), side='right') - 1
+        row_ids = np.maximum(np.maximum.accumulate(row_ids), 0)
+        
+        boundaries = np.flatnonzero(np.diff(row_ids)) + 1
+        sorted_blocks = [blocks[i] for i in order.tolist()]
+        bounds = [0] + boundaries.tolist() + [len(blocks)]
+        return [sorted_blocks[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
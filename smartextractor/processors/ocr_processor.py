@@ -2,6 +2,7 @@
 OCR Processor - Responsible for optical character recognition
 """
 
+import importlib.util
 from typing import List, Optional
 from loguru import logger
 
@@ -9,6 +10,9 @@ from ..config import ExtractionConfig
 from ..models import TextBlock
 from ..exceptions import OCRError, OCRNotAvailableError
 
+# Languages supported by EasyOCR
+EASYOCR_LANGUAGES = ['ch_sim', 'en', 'ja', 'ko']
+
 
 class OCRProcessor:
     """OCR Processor"""
@@ -47,7 +51,7 @@ class OCRProcessor:
         try:
             # Here should implement specific OCR logic
             # Temporarily return empty list
-            logger.info(f"OCR processing page {page_num}")
+            logger.debug(f"OCR processing page {page_num}")
             return []
             
         except Exception as e:
@@ -66,7 +70,24 @@ class OCRProcessor:
                 pass
         
         if self.easyocr_available:
-            # Languages supported by EasyOCR
-            languages.extend(['ch_sim', 'en', 'ja', 'ko'])
+            languages.extend(EASYOCR_LANGUAGES)
+        
+        return list(set(languages))
+    
+    @staticmethod
+    def list_languages(engine: str = "auto") -> List[str]:
+        """Get list of supported languages without initializing the OCR engines"""
+        languages = []
+        
+        if engine in ("tesseract", "auto"):
+            try:
+                import pytesseract
+                languages.extend(pytesseract.get_languages())
+            except Exception:
+                pass
+        
+        # Only check that EasyOCR is installed; importing it would load torch
+        if engine in ("easyocr", "auto") and importlib.util.find_spec("easyocr") is not None:
+            languages.extend(EASYOCR_LANGUAGES)
         
         return list(set(languages)) 
\ No newline at end of file
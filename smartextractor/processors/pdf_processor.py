@@ -2,18 +2,31 @@
 PDF Processor - Responsible for parsing PDF file structure
 """
 
+import mmap
+import multiprocessing
 import os
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 
+import numpy as np
 import PyPDF2
 import pdfplumber
 from loguru import logger
 
+from ..clustering import kmeans_1d
 from ..config import ExtractionConfig
 from ..exceptions import PDFProcessingError, PDFCorruptedError, PDFPasswordProtectedError
 
 
+@lru_cache(maxsize=512)
+def _font_flags(fontname: str) -> Tuple[bool, bool]:
+    """(is_bold, is_italic) for a font name; a document uses only a handful of fonts"""
+    fontname = fontname.lower()
+    return 'bold' in fontname, 'italic' in fontname or 'oblique' in fontname
+
+
 @dataclass
 class TextObject:
     """Text object"""
@@ -68,11 +81,61 @@ class PDFProcessor:
             if not os.path.exists(pdf_path):
                 raise PDFProcessingError(f"PDF file does not exist: {pdf_path}")
             
+            # Memory-map the file so the OS pages in only the regions the parser touches
+            with open(pdf_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                return self.process_buffer(buffer)
+                
+        except PDFProcessingError:
+            raise
+        except Exception as e:
+            logger.error(f"PDF processing failed: {e}")
+            raise PDFProcessingError(f"PDF processing failed: {e}")
+    
+    def process_batch(self, pdf_paths: List[str], workers: Optional[int] = None,
+                      chunksize: int = 4) -> List[PDFData]:
+        """
+        Process many PDF files across worker processes
+        
+        Args:
+            pdf_paths: PDF file paths
+            workers: Number of worker processes, defaults to config.max_workers
+            chunksize: Number of files handed to a worker at a time
+            
+        Returns:
+            PDF data objects, in the same order as pdf_paths
+        """
+        workers = min(workers or self.config.max_workers, len(pdf_paths))
+        if workers <= 1:
+            return [self.process(pdf_path) for pdf_path in pdf_paths]
+        
+        # Parsing is CPU-bound, so worker processes are used to sidestep the GIL;
+        # files are dispatched chunksize at a time to amortize pickling/IPC overhead
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            # map preserves file order and re-raises the first failure
+            return list(executor.map(self.process, pdf_paths, chunksize=max(1, chunksize)))
+    
+    def process_buffer(self, buffer) -> PDFData:
+        """
+        Process PDF content from a seekable binary buffer (e.g. mmap or BytesIO)
+        
+        Args:
+            buffer: Readable, seekable binary file-like object
+            
+        Returns:
+            PDF data object
+        """
+        try:
+            # The buffer has no file name to stat, so measure its size directly
+            buffer.seek(0, os.SEEK_END)
+            file_size = buffer.tell()
+            buffer.seek(0)
+            
             # Use pdfplumber to parse PDF
             try:
-                with pdfplumber.open(pdf_path) as pdf:
+                with pdfplumber.open(buffer) as pdf:
                     # Extract metadata
-                    metadata = self._extract_metadata(pdf)
+                    metadata = self._extract_metadata(pdf, file_size)
                     
                     # Process each page
                     pages = []
@@ -105,7 +168,7 @@ class PDFProcessor:
             logger.error(f"PDF processing failed: {e}")
             raise PDFProcessingError(f"PDF processing failed: {e}")
     
-    def _extract_metadata(self, pdf) -> Dict[str, Any]:
+    def _extract_metadata(self, pdf, file_size: Optional[int] = None) -> Dict[str, Any]:
         """Extract PDF metadata"""
         metadata = {}
         
@@ -116,7 +179,8 @@ class PDFProcessor:
             # Add basic information
             metadata.update({
                 "num_pages": len(pdf.pages),
-                "file_size": os.path.getsize(pdf.stream.name) if hasattr(pdf.stream, 'name') else 0,
+                "file_size": file_size if file_size is not None else (
+                    os.path.getsize(pdf.stream.name) if hasattr(pdf.stream, 'name') else 0),
             })
             
         except Exception as e:
@@ -185,21 +249,13 @@ class PDFProcessor:
                     # 检查是否为超宽文本块（疑似跨两栏）
                     block_width = bbox[2] - bbox[0]
                     if block_width > page.width * 0.60 and len(col_group) > 10:
-                        # 尝试用 x 坐标聚类分成两栏
-                        xs = [char['x0'] for char in col_group]
-                        from sklearn.cluster import KMeans
-                        import numpy as np
-                        X = np.array(xs).reshape(-1, 1)
+                        # 尝试用 x 坐标聚类分成两栏（一维 2-means 精确解，两簇在 x 轴上以 split_x 为界）
+                        xs = np.sort([char['x0'] for char in col_group])
                         try:
-                            kmeans = KMeans(n_clusters=2, random_state=0).fit(X)
-                            labels = kmeans.labels_
-                            left_chars = [char for char, label in zip(col_group, labels) if label == 0]
-                            right_chars = [char for char, label in zip(col_group, labels) if label == 1]
-                            # 按 x 坐标均值排序
-                            left_mean = np.mean([char['x0'] for char in left_chars]) if left_chars else 0
-                            right_mean = np.mean([char['x0'] for char in right_chars]) if right_chars else 0
-                            if left_mean > right_mean:
-                                left_chars, right_chars = right_chars, left_chars
+                            bounds = kmeans_1d(xs, 2)[2]
+                            split_x = xs[bounds[1]] if len(bounds) > 2 else np.inf
+                            left_chars = [char for char in col_group if char['x0'] < split_x]
+                            right_chars = [char for char in col_group if char['x0'] >= split_x]
                             # 生成两个小块
                             for sub_chars in [left_chars, right_chars]:
                                 if len(sub_chars) < 3:
@@ -217,7 +273,7 @@ class PDFProcessor:
                                 ))
                             continue  # 跳过原始大块
                         except Exception as e:
-                            logger.warning(f"[SPLIT] KMeans split failed: {e}")
+                            logger.warning(f"[SPLIT] 2-means split failed: {e}")
                     # 正常情况
                     text_objects.append(TextObject(
                         text=text,
@@ -278,11 +334,7 @@ class PDFProcessor:
         }
         
         # Simple font style detection
-        fontname = char.get('fontname', '').lower()
-        if 'bold' in fontname:
-            font_info['is_bold'] = True
-        if 'italic' in fontname or 'oblique' in fontname:
-            font_info['is_italic'] = True
+        font_info['is_bold'], font_info['is_italic'] = _font_flags(char.get('fontname', ''))
         
         return font_info
     
@@ -19,7 +19,7 @@ class TableProcessor:
     def extract_tables(self, page_data, page_num: int) -> List[TableResult]:
         """Extract tables"""
         try:
-            logger.info(f"Table extraction page {page_num}")
+            logger.debug(f"Table extraction page {page_num}")
             
             tables = []
             
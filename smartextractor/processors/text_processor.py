@@ -2,7 +2,7 @@
 Text Processor - Responsible for text cleaning and post-processing
 """
 
-from typing import List
+from typing import Iterable, Iterator, List
 from loguru import logger
 
 from ..config import ExtractionConfig
@@ -45,29 +45,43 @@ class TextProcessor:
     
     def _clean_text(self, result: ExtractionResult) -> ExtractionResult:
         """Clean text"""
-        # Check if any page has been processed for multi-column layout
-        has_multi_column = any(
-            hasattr(page, '_column_processed') and page._column_processed 
-            for page in result.pages
-        )
-        
-        if has_multi_column:
-            # For multi-column pages,只清理每个文本块的首尾空白和多余空格，保留换行
-            for page in result.pages:
-                for block in page.text_blocks:
-                    if block.text:
-                        # 只去除首尾空白和多余空格，保留换行
-                        block.text = '\n'.join(' '.join(line.strip().split()) for line in block.text.splitlines())
-        else:
-            # For single column pages,同样保留换行
-            result.text = '\n'.join(' '.join(line.strip().split()) for line in result.text.splitlines())
-            # Clean text blocks in each page
-            for page in result.pages:
-                for block in page.text_blocks:
-                    if block.text:
-                        block.text = '\n'.join(' '.join(line.strip().split()) for line in block.text.splitlines())
+        # clean_text keeps line breaks, so the column grouping of multi-column pages is preserved
+        result.text = self.clean_text(result.text)
+        # Clean text blocks in each page
+        for page in result.pages:
+            for block in page.text_blocks:
+                if block.text:
+                    block.text = self.clean_text(block.text)
         return result
     
+    @staticmethod
+    def clean_text(text: str) -> str:
+        """Collapse whitespace within each line and strip it, keeping line breaks"""
+        return '\n'.join(' '.join(line.strip().split()) for line in text.splitlines())
+    
+    @classmethod
+    def iter_clean_text(cls, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Clean text that arrives in chunks
+        
+        Lines are only cleaned once they are complete, so the yielded pieces join to
+        exactly clean_text("".join(chunks)) even when a line spans several chunks.
+        """
+        pending = ""
+        first = True
+        for chunk in chunks:
+            lines = (pending + chunk).splitlines(keepends=True)
+            pending = ""
+            # Hold back the unfinished last line, and a trailing "\r" that may be the start of "\r\n"
+            if lines and (lines[-1].splitlines()[0] == lines[-1] or lines[-1].endswith("\r")):
+                pending = lines.pop()
+            for line in lines:
+                yield cls.clean_text(line) if first else "\n" + cls.clean_text(line)
+                first = False
+        for line in pending.splitlines():
+            yield cls.clean_text(line) if first else "\n" + cls.clean_text(line)
+            first = False
+    
     def _merge_hyphenated_words(self, result: ExtractionResult) -> ExtractionResult:
         """Merge hyphenated words"""
         # TODO: Implement hyphenated word merging logic
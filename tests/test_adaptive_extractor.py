@@ -34,4 +34,48 @@ def test_read_all_pdf_files():
         print(f"try to read {pdf_file}")
         context = extractor.extract_text(str(pdf_file))
         logger.info(f"\t{pdf_file}: {len(context)}")
-        assert len(context) >= 0
\ No newline at end of file
+        assert len(context) >= 0
+
+def test_detect_columns_two_means():
+    extractor = AdaptiveFitzExtractor()
+    x_centers = [150, 155, 160, 148, 450, 455, 460, 452]
+    centers = extractor._detect_columns_kmeans(x_centers, 612)
+    assert len(centers) == 2
+    assert abs(centers[0] - 153.25) < 1e-6
+    assert abs(centers[1] - 454.25) < 1e-6
+    # 所有文本块中心都接近页面中央时不应判定为两列
+    assert extractor._detect_columns_kmeans([300, 305, 310, 298], 612) == []
+    assert extractor._detect_columns_kmeans([300, 300, 300], 612) == []
+
+
+def test_multi_column_reading_order():
+    extractor = AdaptiveFitzExtractor()
+    blocks = [
+        {'text': 'header', 'bbox': (200, 20, 280, 30)},
+        {'text': 'L1', 'bbox': (50, 50, 200, 60)},
+        {'text': 'R1', 'bbox': (330, 50, 500, 60)},
+        {'text': 'L2', 'bbox': (50, 70, 200, 80)},
+        {'text': 'R2', 'bbox': (330, 70, 500, 80)},
+        {'text': 'figure', 'bbox': (50, 100, 500, 110)},
+        {'text': 'L3', 'bbox': (50, 130, 200, 140)},
+        {'text': 'R3', 'bbox': (330, 130, 500, 140)},
+    ]
+    # 通栏的图注把上下两部分分开，各部分内先左栏后右栏
+    assert extractor._extract_multi_column(blocks).split('\n') == [
+        'header', 'L1', 'L2', 'R1', 'R2', 'figure', 'L3', 'R3']
+
+
+def test_multi_column_reading_order_ragged_widths():
+    extractor = AdaptiveFitzExtractor()
+    # 段落宽度参差不齐，左栏最后一行很短
+    blocks = [
+        {'text': 'L1', 'bbox': (50, 50, 290, 150)},
+        {'text': 'R1', 'bbox': (320, 50, 560, 140)},
+        {'text': 'L2', 'bbox': (50, 160, 250, 220)},
+        {'text': 'R2', 'bbox': (320, 150, 540, 300)},
+        {'text': 'L3', 'bbox': (50, 230, 290, 400)},
+        {'text': 'R3', 'bbox': (320, 310, 560, 420)},
+        {'text': 'L4', 'bbox': (50, 410, 110, 420)},
+    ]
+    assert extractor._extract_multi_column(blocks, 612).split('\n') == [
+        'L1', 'L2', 'L3', 'L4', 'R1', 'R2', 'R3']
@@ -102,4 +102,55 @@ def test_extract_all_files():
         except ImportError:
             print("错误: 请确保已安装 scikit-learn 和 numpy (`pip install scikit-learn numpy`)")
         except Exception as e:
-            print(f"处理过程中发生错误: {e}")
\ No newline at end of file
+            print(f"处理过程中发生错误: {e}")
+
+def test_kmeans_1d_and_silhouette():
+    import numpy as np
+    from smartextractor.clustering import kmeans_1d, two_means_1d
+
+    xs = np.sort(np.array([100.0, 102.0, 104.0, 300.0, 302.0, 304.0, 500.0, 502.0]))
+    bounds = kmeans_1d(xs, 3)[3]
+    assert bounds == [0, 3, 6, 8]
+    # 同一个值不会被拆分到不同的簇
+    assert kmeans_1d(np.array([5.0, 5.0, 5.0]), 2)[2] == [0, 3]
+    assert two_means_1d([5.0, 5.0, 5.0]) is None
+    assert two_means_1d([502.0, 100.0, 104.0, 500.0]) == (102.0, 501.0)
+
+    score = AdaptivePlumberExtractor._silhouette_1d(xs, bounds)
+    assert 0.9 < score <= 1.0
+
+
+def test_words_to_text_matches_extract_text(tmp_path):
+    import fitz
+
+    pdf_path = tmp_path / "lines.pdf"
+    with fitz.open() as doc:
+        page = doc.new_page(width=612, height=792)
+        # 基线逐词抬高 2pt：相邻单词在容差内，首尾单词超出容差，pdfplumber 仍视为同一行
+        for i, word in enumerate(["alpha", "beta", "gamma", "delta"]):
+            page.insert_text((50 + i * 60, 100 - i * 2), word, fontsize=10)
+        # 上标
+        page.insert_text((50, 140), "E = mc", fontsize=10)
+        page.insert_text((88, 136), "2", fontsize=6)
+        page.insert_text((50, 180), "plain line", fontsize=10)
+        doc.save(str(pdf_path))
+
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        page = pdf.pages[0]
+        words = page.extract_words(x_tolerance=3, y_tolerance=3, keep_blank_chars=False)
+        assert AdaptivePlumberExtractor._words_to_text(words) == page.extract_text()
+
+
+def test_extract_text_from_file_object():
+    import io
+
+    import fitz
+
+    with fitz.open() as doc:
+        doc.new_page(width=612, height=792).insert_text((50, 100), "hello world", fontsize=10)
+        data = doc.tobytes()
+
+    extractor = AdaptivePlumberExtractor()
+    assert extractor.extract_text(io.BytesIO(data)) == "hello world"
+    # 非路径输入不进入文档级布局缓存
+    assert not extractor._layout_cache
@@ -41,6 +41,22 @@ class TestSmartExtractor:
         with pytest.raises(ValueError):
             ExtractionConfig(ocr_engine="invalid")
     
+    def test_processors_shared_across_instances(self):
+        """Test extractors with equal configs share processors"""
+        first = SmartExtractor(ExtractionConfig(enable_ocr=False))
+        second = SmartExtractor(ExtractionConfig(enable_ocr=False))
+        other = SmartExtractor(ExtractionConfig(enable_ocr=False, detect_headers=False))
+        assert first.layout_processor is second.layout_processor
+        assert first.layout_processor is not other.layout_processor
+        
+        # The cache does not keep processors alive on its own
+        import gc
+        from smartextractor.processors.layout_processor import LayoutProcessor
+        cache_key = (LayoutProcessor, other.config)
+        del other
+        gc.collect()
+        assert cache_key not in SmartExtractor._processor_cache
+    
     def test_nonexistent_pdf(self):
         """Test nonexistent PDF file"""
         extractor = SmartExtractor()
@@ -63,6 +79,93 @@ class TestSmartExtractor:
         languages = extractor.get_supported_languages()
         assert isinstance(languages, list)
 
+    def test_skip_ocr_with_text_layer(self):
+        """Test OCR is skipped when the text layer is sufficient"""
+        from smartextractor.processors.pdf_processor import PDFData, PageData, TextObject
+        
+        extractor = SmartExtractor()
+        page_data = PageData(page_number=1, width=612, height=792,
+                             text_objects=[TextObject(text="x" * 300, bbox=[0, 0, 100, 10])],
+                             images=[], tables=[])
+        pdf_data = PDFData(pages=[page_data], metadata={}, num_pages=1, is_encrypted=False)
+        pages = extractor._process_pages(pdf_data)
+        assert [page.page_number for page in pages] == [1]
+        # The OCR processor is never initialized
+        assert "ocr_processor" not in vars(extractor)
+
+    def test_process_pages_parallel(self):
+        """Test multi-page documents go through the worker pool and keep page order"""
+        from smartextractor.processors.pdf_processor import PDFData, PageData, TextObject
+
+        def make_pdf_data(num_pages):
+            pages = [PageData(page_number=i, width=612, height=792,
+                              text_objects=[TextObject(text=f"page {i}", bbox=[0, 0, 100, 10])],
+                              images=[], tables=[])
+                     for i in range(num_pages)]
+            return PDFData(pages=pages, metadata={}, num_pages=num_pages, is_encrypted=False)
+
+        config = ExtractionConfig(enable_ocr=False, max_workers=2, parallel_page_threshold=1)
+        with SmartExtractor(config) as extractor:
+            # A single page is processed in the calling process
+            pages = extractor._process_pages(make_pdf_data(1))
+            assert [page.text_blocks[0].text for page in pages] == ["page 0"]
+            assert extractor._executor is None
+
+            pages = extractor._process_pages(make_pdf_data(5))
+            assert extractor._executor is not None
+            assert [page.page_number for page in pages] == [1, 2, 3, 4, 5]
+            assert [page.text_blocks[0].text for page in pages] == [f"page {i}" for i in range(5)]
+        assert extractor._executor is None
+
+    def test_merge_results_to_stream(self):
+        """Test merged text is written to the output stream"""
+        import io
+        from smartextractor.models import PageResult, TextBlock
+        
+        pages = [
+            PageResult(page_number=1, text_blocks=[TextBlock(text="  first   block ", bbox=[0, 0, 1, 1])]),
+            PageResult(page_number=2, text_blocks=[TextBlock(text="second", bbox=[0, 0, 1, 1])]),
+        ]
+        output_stream = io.StringIO()
+        result = SmartExtractor()._merge_results(iter(pages), {}, output_stream)
+        assert output_stream.getvalue() == "first block\n\nsecond"
+        assert result.text == "" and result.pages == []
+        assert result.metadata["text_length"] == len(output_stream.getvalue())
+
+    def test_stream_matches_extract_text(self, monkeypatch):
+        """Test streamed text equals the post-processed text of extract()"""
+        import io
+        from types import SimpleNamespace
+        from smartextractor.models import PageResult, TextBlock
+        from smartextractor.processors.pdf_processor import PDFData
+
+        def make_pages():
+            pages = [
+                PageResult(page_number=1, text_blocks=[
+                    TextBlock(text="Hello   world\n", bbox=[0, 0, 1, 1]),
+                    TextBlock(text="second block", bbox=[0, 1, 1, 2]),
+                ]),
+                PageResult(page_number=2, text_blocks=[
+                    TextBlock(text="  left\tcolumn  ", bbox=[0, 0, 1, 1]),
+                    TextBlock(text="right  column\r\n", bbox=[2, 0, 3, 1]),
+                ]),
+            ]
+            pages[1]._column_processed = True
+            return pages
+
+        extractor = SmartExtractor(ExtractionConfig(enable_ocr=False, fast_text_only=False))
+        pdf_data = PDFData(pages=[], metadata={}, num_pages=2, is_encrypted=False)
+        monkeypatch.setattr(extractor, "_validate_pdf_file", lambda pdf_path: None)
+        monkeypatch.setattr(extractor, "pdf_processor", SimpleNamespace(process=lambda pdf_path: pdf_data))
+        monkeypatch.setattr(extractor, "_iter_page_results", lambda *args: iter(make_pages()))
+
+        output_stream = io.StringIO()
+        summary = extractor.extract("doc.pdf", output_stream)
+        text = extractor.extract("doc.pdf").text
+        assert text == "Hello world\n\n\nsecond block\n\nleft column\nright column"
+        assert output_stream.getvalue() == text
+        assert summary.metadata["text_length"] == len(text)
+
     def test_two_columns_pdf(self):
         config = ExtractionConfig(
             enable_ocr=False,
@@ -157,6 +260,16 @@ class TestExtractionConfig:
         assert config.confidence_threshold == 0.9
         assert config.max_workers == 8
 
+    
+    def test_frozen(self):
+        """Test config is immutable and hashable"""
+        import dataclasses
+        
+        config = ExtractionConfig(max_workers=8)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.max_workers = 2
+        assert hash(config) == hash(ExtractionConfig(max_workers=8))
+
 
 class TestModels:
     """Data Models Test Class"""
@@ -204,4 +317,72 @@ class TestModels:
         table_dict = table.to_dict()
         assert "rows" in table_dict
         assert "cols" in table_dict
-        assert "cells" in table_dict 
\ No newline at end of file
+        assert "cells" in table_dict
+        
+        # Test compact cell encoding
+        compact_cells = table.to_dict(compact=True)["cells"]
+        assert compact_cells["schema"][0] == "text"
+        assert [row[0] for row in compact_cells["data"]] == ["Header1", "Header2", "Data1", "Data2"]
+    
+    def test_save_json_matches_to_json(self, tmp_path):
+        """Test that the streamed save_json writes the same document as to_json"""
+        from smartextractor.models import ExtractionResult, PageResult, TextBlock
+        
+        pages = [
+            PageResult(
+                page_number=i,
+                text_blocks=[TextBlock(text=f"Line {i}\n\"quoted\"", bbox=[0, 0, 100, 20])]
+            )
+            for i in range(1, 4)
+        ]
+        result = ExtractionResult(text="", pages=pages, metadata={"title": "Test"})
+        
+        output = tmp_path / "result.json"
+        result.save_json(str(output))
+        assert output.read_text(encoding="utf-8") == result.to_json()
+    
+    def test_to_json_metadata_types(self):
+        """Test non-str keys and numpy values in metadata serialize like json.dumps"""
+        import json
+        import numpy as np
+        from smartextractor.models import ExtractionResult
+        
+        result = ExtractionResult(text="a", pages=[],
+                                  metadata={1: "a", "score": np.float64(0.5), "count": np.int64(3)})
+        expected = {"1": "a", "score": 0.5, "count": 3}
+        assert json.loads(result.to_json())["metadata"] == expected
+        assert json.loads(result.to_json(indent=4))["metadata"] == expected
+    
+    def test_get_tables_by_page(self):
+        """Test page lookups stay current when pages are appended"""
+        from smartextractor.models import ExtractionResult, PageResult, TableResult
+        
+        table = TableResult(cells=[], rows=0, cols=0, bbox=[0, 0, 0, 0])
+        result = ExtractionResult(text="", pages=[PageResult(page_number=1, tables=[table])])
+        
+        assert result.get_tables_by_page(1) == [table]
+        assert result.get_tables_by_page(2) == []
+        
+        result.pages.append(PageResult(page_number=2, tables=[table]))
+        assert result.get_tables_by_page(2) == [table]
+        assert result.get_images_by_page(2) == []
+    
+    def test_aggregates_from_pages(self):
+        """Test text/tables are built from pages only when not provided at construction"""
+        from smartextractor.models import ExtractionResult, PageResult, TableResult, TextBlock
+        
+        table = TableResult(cells=[], rows=0, cols=0, bbox=[0, 0, 0, 0])
+        page = PageResult(page_number=1, text_blocks=[TextBlock(text="hello", bbox=[0, 0, 1, 1])],
+                          tables=[table])
+        
+        result = ExtractionResult(text="", pages=[page])
+        assert result.text == "hello"
+        assert result.tables == [table]
+        
+        # Explicit assignments are kept, even when empty
+        result = ExtractionResult(text="x", pages=[page])
+        result.text = ""
+        result.tables = []
+        assert result.text == ""
+        assert result.tables == []
+    